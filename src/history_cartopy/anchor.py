@@ -5,6 +5,8 @@ Each location has an invisible anchor circle. Attachments (labels, icons,
 campaign arrows) terminate on this circle's perimeter, distributed evenly.
 """
 import math
+from functools import lru_cache
+
 import numpy as np
 
 from history_cartopy.themes import CITY_LEVELS
@@ -189,25 +191,40 @@ class AnchorCircle:
         Returns:
             List of (position_name, x_offset_pts, y_offset_pts, ha, va) in priority order
         """
-        candidates = []
-        total_radius = self.radius + gap_pts
+        return list(compute_candidate_offsets(self.radius + gap_pts))
+
+
+@lru_cache(maxsize=64)
+def compute_candidate_offsets(radius):
+    """
+    Compute the 8 Imhof candidate label offsets for a circle of given radius.
+
+    Only a handful of radii occur on a map (per city level and distance
+    tier), so results are cached.
+
+    Args:
+        radius: Total distance from the anchor point to the label (in points)
 
-        for pos_name in POSITION_PRIORITY:
-            angle_deg = POSITION_ANGLES[pos_name]
-            # Convert to radians (0 = North, clockwise)
-            # Math convention: 0 = East, counter-clockwise
-            # So we adjust: math_angle = 90 - our_angle
-            angle_rad = math.radians(90 - angle_deg)
+    Returns:
+        Tuple of (position_name, x_offset_pts, y_offset_pts, ha, va) in priority order
+    """
+    candidates = []
+    for pos_name in POSITION_PRIORITY:
+        angle_deg = POSITION_ANGLES[pos_name]
+        # Convert to radians (0 = North, clockwise)
+        # Math convention: 0 = East, counter-clockwise
+        # So we adjust: math_angle = 90 - our_angle
+        angle_rad = math.radians(90 - angle_deg)
 
-            x_offset = total_radius * math.cos(angle_rad)
-            y_offset = total_radius * math.sin(angle_rad)
+        x_offset = radius * math.cos(angle_rad)
+        y_offset = radius * math.sin(angle_rad)
 
-            # Get alignment for this position
-            ha, va = POSITION_ALIGNMENT[pos_name]
+        # Get alignment for this position
+        ha, va = POSITION_ALIGNMENT[pos_name]
 
-            candidates.append((pos_name, x_offset, y_offset, ha, va))
+        candidates.append((pos_name, x_offset, y_offset, ha, va))
 
-        return candidates
+    return tuple(candidates)
 
 
 def compute_campaign_angle(from_coords, to_coords):
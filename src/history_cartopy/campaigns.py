@@ -207,12 +207,14 @@ def collect_campaign_labels(manifest, resolved_arrows, placement_manager):
 
     logger.debug(f"Collecting campaign labels from {len(resolved_arrows)} resolved arrows")
 
+    # Look arrows up by campaign index rather than rebuilding each slugged ID
+    resolved_by_idx = {arrow.campaign_idx: arrow for arrow in resolved_arrows.values()}
+
     for idx, item in enumerate(campaigns):
-        arrow_id = _campaign_arrow_id(idx, item)
-        if arrow_id not in resolved_arrows:
+        resolved = resolved_by_idx.get(idx)
+        if resolved is None:
             continue
 
-        resolved = resolved_arrows[arrow_id]
         geometry = resolved.resolved_geometry
         campaign_group = f"campaign_{idx}"
 
@@ -359,17 +361,14 @@ def render_campaigns_resolved(ax, campaign_render_data, resolved_positions):
 
         if above_id in resolved_positions:
             resolved = resolved_positions[above_id]
-            if hasattr(resolved, 'segment_idx'):
-                resolved_seg_idx = resolved.segment_idx
-            if hasattr(resolved, 'is_swapped'):
-                above_swapped = resolved.is_swapped
+            resolved_seg_idx = resolved.segment_idx
+            above_swapped = resolved.is_swapped
 
         if below_id in resolved_positions:
             resolved = resolved_positions[below_id]
-            if resolved_seg_idx is None and hasattr(resolved, 'segment_idx'):
+            if resolved_seg_idx is None:
                 resolved_seg_idx = resolved.segment_idx
-            if hasattr(resolved, 'is_swapped'):
-                below_swapped = resolved.is_swapped
+            below_swapped = resolved.is_swapped
 
         # Use resolved segment if available
         if resolved_seg_idx is not None:
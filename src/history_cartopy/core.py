@@ -5,25 +5,51 @@ import yaml
 
 logger = logging.getLogger('history_cartopy.core')
 
+# libyaml's C parser when PyYAML was built with it, else the pure-Python one.
+# Both construct the same safe subset of YAML.
+_SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
 
-def load_data(gazetteer_path, manifest_path):
+
+def load_gazetteer(gazetteer_path):
     """
-    Load gazetteer and manifest YAML files.
+    Load the gazetteer YAML file.
 
     Args:
         gazetteer_path: Path to the gazetteer YAML file
-        manifest_path: Path to the map manifest YAML file
 
     Returns:
-        (gazetteer, manifest) tuple
+        Dict mapping location name -> [lon, lat]
     """
     with open(gazetteer_path, 'r') as f:
-        gazetteer = yaml.safe_load(f)['locations']
+        return yaml.load(f, Loader=_SafeLoader)['locations']
+
 
+def load_manifest(manifest_path):
+    """
+    Load a map manifest YAML file.
+
+    Args:
+        manifest_path: Path to the map manifest YAML file
+
+    Returns:
+        Parsed manifest dict
+    """
     with open(manifest_path, 'r') as f:
-        manifest = yaml.safe_load(f)
+        return yaml.load(f, Loader=_SafeLoader)
 
-    return gazetteer, manifest
+
+def load_data(gazetteer_path, manifest_path):
+    """
+    Load gazetteer and manifest YAML files.
+
+    Args:
+        gazetteer_path: Path to the gazetteer YAML file
+        manifest_path: Path to the map manifest YAML file
+
+    Returns:
+        (gazetteer, manifest) tuple
+    """
+    return load_gazetteer(gazetteer_path), load_manifest(manifest_path)
 
 
 def get_offsets(item):
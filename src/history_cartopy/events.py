@@ -7,12 +7,11 @@ at the location.
 """
 
 import logging
-import os
 
 from history_cartopy.styles import apply_text
-from history_cartopy.icons import render_icon, DEFAULT_ICONSET, ICON_SIZE_PT
-from history_cartopy.anchor import AnchorCircle
-from history_cartopy.themes import EVENT_CONFIG, LABEL_STYLES, ICONSET
+from history_cartopy.icons import render_icon, resolve_iconset_path, ICON_SIZE_PT
+from history_cartopy.anchor import compute_candidate_offsets
+from history_cartopy.themes import EVENT_CONFIG, LABEL_STYLES
 from history_cartopy.placement import LabelCandidate, PRIORITY
 
 logger = logging.getLogger('history_cartopy.events')
@@ -36,9 +35,7 @@ def collect_events(gazetteer, manifest, placement_manager, data_dir=None):
     """
     pm = placement_manager
 
-    # Resolve iconset path
-    iconset_name = manifest.get('metadata', {}).get('iconset') or ICONSET.get('path', DEFAULT_ICONSET)
-    iconset_path = os.path.join(data_dir, iconset_name) if data_dir else None
+    iconset_path = resolve_iconset_path(manifest, data_dir)
 
     event_candidates = []
     event_render_data = []
@@ -98,27 +95,20 @@ def collect_events(gazetteer, manifest, placement_manager, data_dir=None):
                 group=event_group,
             )
 
-        # Generate 8 candidate positions for text label using AnchorCircle
+        # Generate 8 candidate positions for text label around the anchor circle
         if text:
-            # Create anchor circle for this event
-            # Use a custom radius from EVENT_CONFIG
-            anchor_radius = EVENT_CONFIG['anchor_radius']
-
-            # Create a simple anchor for candidate generation
-            anchor = AnchorCircle(city_level=2)  # Use level 2 as base
-            anchor.radius = anchor_radius  # Override with event-specific radius
+            # Events use their own anchor radius from EVENT_CONFIG
+            candidate_offsets = compute_candidate_offsets(EVENT_CONFIG['anchor_radius'])
 
             fontsize = LABEL_STYLES.get('event_text', {}).get('fontsize', 9)
             subtext_fontsize = LABEL_STYLES.get('event_subtext', {}).get('fontsize', 7)
-            block_height = fontsize + subtext_fontsize + 2 if subtext else fontsize
-            candidate_offsets = anchor.get_candidate_offsets(gap_pts=0, text_height_pts=block_height)
 
             logger.debug(f"Event '{event_id}' at ({lon:.2f}, {lat:.2f}): generating {len(candidate_offsets)} candidate positions")
 
             text_positions = []
             for pos_name, x_off, y_off, ha, va in candidate_offsets:
-                element = pm.add_label(
-                    f"event_text_{event_id}_{pos_name}",
+                element = pm._build_label(
+                    f"event_text_{event_id}",
                     (lon, lat),
                     text,
                     fontsize=fontsize,
@@ -132,13 +122,9 @@ def collect_events(gazetteer, manifest, placement_manager, data_dir=None):
                     subtext=subtext if subtext else None,
                     subtext_fontsize=subtext_fontsize if subtext else None,
                 )
-                element.id = f"event_text_{event_id}"
-                element.ha = ha
-                element.va = va
                 logger.debug(f"  Position {pos_name}: offset=({x_off:.1f}, {y_off:.1f})pts, ha={ha}, va={va}, "
                            f"bbox=({element.bbox[0]:.3f}, {element.bbox[1]:.3f}, "
                            f"{element.bbox[2]:.3f}, {element.bbox[3]:.3f})")
-                pm.remove(f"event_text_{event_id}_{pos_name}")
                 text_positions.append(element)
 
             event_candidates.append(LabelCandidate(
@@ -167,12 +153,7 @@ def render_events_resolved(ax, event_render_data, resolved_positions, data_dir=N
     """
     from history_cartopy.styles import get_deg_per_pt
 
-    # Resolve iconset path
-    if manifest:
-        iconset_name = manifest.get('metadata', {}).get('iconset') or ICONSET.get('path', DEFAULT_ICONSET)
-        iconset_path = os.path.join(data_dir, iconset_name) if data_dir else None
-    else:
-        iconset_path = None
+    iconset_path = resolve_iconset_path(manifest, data_dir) if manifest else None
 
     dpp = get_deg_per_pt(ax)
 
@@ -191,15 +172,14 @@ def render_events_resolved(ax, event_render_data, resolved_positions, data_dir=N
             main_fontsize = LABEL_STYLES.get('event_text', {}).get('fontsize', 9)
             line_height = main_fontsize + 2  # pts between text centers
 
-            text_id = f"event_text_{event_id}"
-            if text_id in resolved_positions:
-                resolved = resolved_positions[text_id]
+            resolved = resolved_positions.get(f"event_text_{event_id}")
+            if resolved is not None:
                 x_offset_pts = resolved.offset[0] / dpp
                 y_offset_pts = resolved.offset[1] / dpp
 
-                # Use alignment from resolved element
-                ha = getattr(resolved, 'ha', 'left')
-                va = getattr(resolved, 'va', 'bottom')
+                # Alignment is stored on the element by add_label()
+                ha = resolved.ha
+                va = resolved.va
 
                 apply_text(ax, lon, lat, event['text'], 'event_text',
                            x_offset=x_offset_pts, y_offset=y_offset_pts,
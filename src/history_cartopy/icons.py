@@ -7,6 +7,7 @@ with proper scaling and anchor point positioning.
 This module is a "dumb" renderer - it takes offsets as parameters.
 Placement logic (anchor circles) is handled by core.py.
 """
+import logging
 import os
 from PIL import Image
 import numpy as np
@@ -14,9 +15,16 @@ from matplotlib.transforms import offset_copy
 from matplotlib.offsetbox import OffsetImage, AnnotationBbox
 import cartopy.crs as ccrs
 
+from history_cartopy.themes import ICONSET
+
+logger = logging.getLogger('history_cartopy.icons')
+
 # Icon cache to avoid reloading
 _icon_cache = {}
 
+# Resolved iconset directories, keyed by (iconset_name, data_dir)
+_iconset_path_cache = {}
+
 # Default icon size in points (72 points = 1 inch)
 ICON_SIZE_PT = 14
 
@@ -30,6 +38,35 @@ AUTO_ICONS = {
 }
 
 
+def resolve_iconset_path(manifest, data_dir):
+    """
+    Resolve the iconset directory for a manifest.
+
+    The manifest's metadata.iconset wins over the active theme's iconset.
+    Results are cached, and a missing directory is warned about once here
+    rather than on every render_icon() call.
+
+    Args:
+        manifest: Parsed YAML manifest
+        data_dir: Data directory path (None disables icons)
+
+    Returns:
+        Full path to the iconset directory, or None if data_dir is not set
+    """
+    if not data_dir:
+        return None
+    iconset_name = manifest.get('metadata', {}).get('iconset') or ICONSET.get('path', DEFAULT_ICONSET)
+    cache_key = (iconset_name, data_dir)
+    if cache_key in _iconset_path_cache:
+        return _iconset_path_cache[cache_key]
+
+    iconset_path = os.path.join(data_dir, iconset_name)
+    if not os.path.isdir(iconset_path):
+        logger.warning(f"Iconset directory not found: {iconset_path}")
+    _iconset_path_cache[cache_key] = iconset_path
+    return iconset_path
+
+
 def load_icon(icon_name, iconset_path):
     """
     Load a PNG icon from the iconset directory.
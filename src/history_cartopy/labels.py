@@ -1,18 +1,32 @@
 """Label handling for cities, rivers, and regions."""
 
 import logging
-import os
+
 import cartopy.crs as ccrs
 
 from history_cartopy.core import get_offsets
-from history_cartopy.styles import apply_text
+from history_cartopy.styles import apply_text, get_deg_per_pt
 from history_cartopy.anchor import AnchorCircle
-from history_cartopy.icons import render_icon, DEFAULT_ICONSET
-from history_cartopy.themes import CITY_LEVELS, LABEL_STYLES, ICONSET
+from history_cartopy.icons import render_icon, resolve_iconset_path
+from history_cartopy.themes import CITY_LEVELS, LABEL_STYLES
 from history_cartopy.placement import LabelCandidate, PRIORITY
+from history_cartopy.river_alignment import (
+    angle_to_normal, get_river_angle, sample_river_positions
+)
 
 logger = logging.getLogger('history_cartopy.labels')
 
+# Labels anchored this far (in points) outside the viewport can still reach
+# into it, so they keep full candidate generation.
+VIEWPORT_PAD_PTS = 150
+
+
+def _in_viewport(lon, lat, viewport_bbox, pad_deg):
+    """Check whether (lon, lat) lies inside viewport_bbox grown by pad_deg."""
+    lon_min, lon_max, lat_min, lat_max = viewport_bbox
+    return (lon_min - pad_deg <= lon <= lon_max + pad_deg and
+            lat_min - pad_deg <= lat <= lat_max + pad_deg)
+
 
 def _bbox_within_extent(bbox, extent):
     """
@@ -30,12 +44,150 @@ def _bbox_within_extent(bbox, extent):
     return x1 >= west and x2 <= east and y1 >= south and y2 <= north
 
 
-def collect_labels(gazetteer, manifest, placement_manager, data_dir=None):
+def _city_label_positions(pm, name, display, coords, anchor, fontsize, priority, group):
+    """
+    Build candidate label elements for a city at multiple distance tiers.
+
+    Tier 1: 1x radius (8 positions) - preferred, closest to city
+    Tier 2: 1.3x radius (8 positions) - fallback
+    Tier 3: 1.6x radius (8 positions) - last resort
+
+    Elements are built outside the registry; only resolve_greedy() adds the
+    chosen one to the PlacementManager.
+    """
+    offsets = []
+    for multiplier in (1.0, 1.3, 1.6):
+        # gap_pts adds to the base radius
+        extra_gap = anchor.radius * (multiplier - 1.0)
+        offsets.extend(
+            (x_off, y_off, ha, va)
+            for _, x_off, y_off, ha, va in anchor.get_candidate_offsets(gap_pts=extra_gap)
+        )
+
+    return pm._build_labels(
+        f"city_label_{name}",
+        coords,
+        display,
+        fontsize=fontsize,
+        offsets=offsets,
+        priority=priority,
+        element_type='city_label',
+        group=group,
+    )
+
+
+def _build_city_candidate(pm, item, coords, iconset_path):
+    """
+    Build the label candidate and render data for one city.
+
+    Label elements are built outside pm's registry; the caller registers
+    the city's dot and icon afterwards.
+
+    Returns:
+        (LabelCandidate, render_data dict)
+    """
+    name = item['name']
+    display = item.get('display_as', name)
+    level = item.get('level', 2)
+    level_config = CITY_LEVELS.get(level, CITY_LEVELS[2])
+    lon, lat = coords
+
+    # Create anchor circle for this location
+    anchor = AnchorCircle(city_level=level)
+
+    icon_setting = item.get('icon', None)
+    has_icon = icon_setting and iconset_path is not None
+
+    if has_icon:
+        icon_idx = anchor.add_attachment('icon', preferred_angle=0)
+    label_idx = anchor.add_attachment('label', preferred_angle=45)
+
+    manual_ox, manual_oy = get_offsets(item)
+    use_manual_offset = not (manual_ox == 0.0 and manual_oy == 0.0)
+
+    anchor.resolve()
+
+    # Calculate icon offset (fixed position)
+    icon_ox, icon_oy = 0, 0
+    icon_name = None
+    if has_icon:
+        icon_name = icon_setting if isinstance(icon_setting, str) else level_config['default_icon']
+        if icon_name:
+            icon_ox, icon_oy = anchor.get_offset(icon_idx)
+
+    # Get label style info
+    label_style = LABEL_STYLES.get(level_config['label_style'], {})
+    fontsize = label_style.get('fontsize', 9)
+    city_group = f"city_{name}"
+    # Labels can move around the anchor, so they sit below the fixed dots/icons
+    label_priority = PRIORITY.get(f'city_label_{level}', 44)
+
+    render_data = {
+        'name': name,
+        'display': display,
+        'level': level,
+        'level_config': level_config,
+        'coords': (lon, lat),
+        'icon_name': icon_name,
+        'icon_offset': (icon_ox, icon_oy),
+        'use_manual_offset': use_manual_offset,
+        'manual_offset': (manual_ox, manual_oy),
+        'fontsize': fontsize,
+        'group': city_group,
+    }
+
+    # If manual offset, don't generate candidates - use fixed position
+    if use_manual_offset:
+        # Create single-position candidate with manual offset
+        element = pm._build_label(
+            f"city_label_{name}",
+            (lon, lat),
+            display,
+            fontsize=fontsize,
+            x_offset_pts=manual_ox,
+            y_offset_pts=manual_oy,
+            priority=label_priority,
+            element_type='city_label',
+            group=city_group,
+            ha='left',
+            va='top',
+        )
+
+        candidate = LabelCandidate(
+            id=f"city_label_{name}",
+            element_type='city_label',
+            priority=label_priority,
+            group=city_group,
+            positions=[element],
+        )
+    else:
+        positions = _city_label_positions(
+            pm, name, display, (lon, lat), anchor, fontsize, label_priority, city_group
+        )
+
+        candidate = LabelCandidate(
+            id=f"city_label_{name}",
+            element_type='city_label',
+            priority=label_priority,
+            group=city_group,
+            positions=positions,
+            fallback_idx=8,  # First position of 1.3x tier
+        )
+
+    return candidate, render_data
+
+
+def collect_labels(gazetteer, manifest, placement_manager, data_dir=None,
+                   viewport_bbox=None):
     """
     Collect all label data without rendering.
 
     Phase 1 of the three-phase flow: Collect -> Resolve -> Render
 
+    If viewport_bbox (lon_min, lon_max, lat_min, lat_max) is given, cities,
+    fixed rivers and regions anchored beyond it (plus VIEWPORT_PAD_PTS) are
+    skipped: they can never be seen, so they get no candidates.
+
     Returns:
         (city_candidates, river_candidates, river_data, region_data, city_render_data)
         - city_candidates: list of LabelCandidate with multiple positions each
@@ -47,9 +199,7 @@ def collect_labels(gazetteer, manifest, placement_manager, data_dir=None):
     labels = manifest.get('labels', {})
     pm = placement_manager
 
-    # Resolve iconset path
-    iconset_name = manifest.get('metadata', {}).get('iconset') or ICONSET.get('path', DEFAULT_ICONSET)
-    iconset_path = os.path.join(data_dir, iconset_name) if data_dir else None
+    iconset_path = resolve_iconset_path(manifest, data_dir)
 
     city_candidates = []
     city_render_data = []
@@ -61,151 +211,43 @@ def collect_labels(gazetteer, manifest, placement_manager, data_dir=None):
     cities = labels.get('cities', [])
     logger.debug(f"Collecting {len(cities)} cities for candidate generation")
 
+    pad_deg = VIEWPORT_PAD_PTS * pm.dpp
+
     for item in cities:
         name = item['name']
-        display = item.get('display_as', name)
-        level = item.get('level', 2)
-        level_config = CITY_LEVELS.get(level, CITY_LEVELS[2])
-
         if name not in gazetteer:
             logger.warning(f"City '{name}' not found in gazetteer")
             continue
-        lon, lat = gazetteer[name]
-
-        # Create anchor circle for this location
-        anchor = AnchorCircle(city_level=level)
-
-        icon_setting = item.get('icon', None)
-        has_icon = icon_setting and iconset_path is not None
-
-        if has_icon:
-            icon_idx = anchor.add_attachment('icon', preferred_angle=0)
-        label_idx = anchor.add_attachment('label', preferred_angle=45)
-
-        manual_ox, manual_oy = get_offsets(item)
-        use_manual_offset = not (manual_ox == 0.0 and manual_oy == 0.0)
-
-        anchor.resolve()
-
-        # Calculate icon offset (fixed position)
-        icon_ox, icon_oy = 0, 0
-        icon_name = None
-        if has_icon:
-            icon_name = icon_setting if isinstance(icon_setting, str) else level_config['default_icon']
-            if icon_name:
-                icon_ox, icon_oy = anchor.get_offset(icon_idx)
-
-        # Get label style info
-        label_style = LABEL_STYLES.get(level_config['label_style'], {})
-        fontsize = label_style.get('fontsize', 9)
-        city_group = f"city_{name}"
-        # Separate priorities: dots/icons are fixed (high), labels can move (lower)
-        dot_priority = PRIORITY.get(f'city_level_{level}', 60)
-        label_priority = PRIORITY.get(f'city_label_{level}', 44)
-
-        # Store render data
-        city_render_data.append({
-            'name': name,
-            'display': display,
-            'level': level,
-            'level_config': level_config,
-            'coords': (lon, lat),
-            'icon_name': icon_name,
-            'icon_offset': (icon_ox, icon_oy),
-            'use_manual_offset': use_manual_offset,
-            'manual_offset': (manual_ox, manual_oy),
-            'fontsize': fontsize,
-            'group': city_group,
-        })
-
-        # If manual offset, don't generate candidates - use fixed position
-        if use_manual_offset:
-            # Create single-position candidate with manual offset
-            element = pm.add_label(
-                f"city_label_{name}",
-                (lon, lat),
-                display,
-                fontsize=fontsize,
-                x_offset_pts=manual_ox,
-                y_offset_pts=manual_oy,
-                priority=label_priority,
-                element_type='city_label',
-                group=city_group,
-            )
-            # Remove from pm.elements - we'll add back during resolve
-            pm.remove(f"city_label_{name}")
-
-            candidate = LabelCandidate(
-                id=f"city_label_{name}",
-                element_type='city_label',
-                priority=label_priority,
-                group=city_group,
-                positions=[element],
-            )
-            city_candidates.append(candidate)
-        else:
-            # Generate candidate positions at multiple distance tiers
-            # Tier 1: 1x radius (8 positions) - preferred, closest to city
-            # Tier 2: 1.5x radius (8 positions) - fallback
-            # Tier 3: 2x radius (8 positions) - last resort
-            positions = []
-            distance_multipliers = [1.0, 1.3, 1.6]
-
-            for multiplier in distance_multipliers:
-                # gap_pts adds to the base radius
-                extra_gap = anchor.radius * (multiplier - 1.0)
-                candidate_offsets = anchor.get_candidate_offsets(gap_pts=extra_gap, text_height_pts=fontsize)
-
-                for pos_name, x_off, y_off, ha, va in candidate_offsets:
-                    tier_suffix = f"_t{int(multiplier*10)}"  # e.g., _t10, _t15, _t20
-                    element = pm.add_label(
-                        f"city_label_{name}_{pos_name}{tier_suffix}",
-                        (lon, lat),
-                        display,
-                        fontsize=fontsize,
-                        x_offset_pts=x_off,
-                        y_offset_pts=y_off,
-                        priority=label_priority,
-                        element_type='city_label',
-                        group=city_group,
-                        ha=ha,
-                        va=va,
-                    )
-                    element.id = f"city_label_{name}"
-                    # Store alignment info for rendering
-                    element.ha = ha
-                    element.va = va
-                    pm.remove(f"city_label_{name}_{pos_name}{tier_suffix}")
-                    positions.append(element)
-
-            candidate = LabelCandidate(
-                id=f"city_label_{name}",
-                element_type='city_label',
-                priority=label_priority,
-                group=city_group,
-                positions=positions,
-                fallback_idx=8,  # First position of 1.3x tier
-            )
-            city_candidates.append(candidate)
-
-        # Add fixed elements (dots, icons) - these don't move
-        pm.add_dot(
-            f"city_dot_{name}",
-            (lon, lat),
-            size_pts=level_config['dot_outer_size'],
-            priority=dot_priority,
-            group=city_group,
-        )
-        if icon_name:
+        if viewport_bbox and not _in_viewport(*gazetteer[name], viewport_bbox, pad_deg):
+            logger.debug(f"City '{name}' is outside the viewport, skipping")
+            continue
+        candidate, render = _build_city_candidate(pm, item, tuple(gazetteer[name]), iconset_path)
+        city_candidates.append(candidate)
+        city_render_data.append(render)
+
+    # Add fixed elements (dots, icons) - these don't move
+    dot_priorities = [PRIORITY.get(f"city_level_{render['level']}", 60)
+                      for render in city_render_data]
+    pm.add_dots(
+        [f"city_dot_{render['name']}" for render in city_render_data],
+        [render['coords'] for render in city_render_data],
+        sizes_pts=[render['level_config']['dot_outer_size'] for render in city_render_data],
+        priorities=dot_priorities,
+        groups=[render['group'] for render in city_render_data],
+    )
+    for render, dot_priority in zip(city_render_data, dot_priorities):
+        name = render['name']
+        if render['icon_name']:
+            icon_ox, icon_oy = render['icon_offset']
             pm.add_icon(
                 f"city_icon_{name}",
-                (lon, lat),
+                render['coords'],
                 size_pts=25,
                 x_offset_pts=icon_ox,
                 y_offset_pts=icon_oy,
                 priority=dot_priority,
                 element_type='city_icon',
-                group=city_group,
+                group=render['group'],
             )
 
     # 2. Collect Rivers
@@ -226,9 +268,11 @@ def collect_labels(gazetteer, manifest, placement_manager, data_dir=None):
         if 'coords' in item:
             # Fixed position
             lon, lat = item['coords']
+            if viewport_bbox and not _in_viewport(lon, lat, viewport_bbox, pad_deg):
+                logger.debug(f"River '{river_name}' is outside the viewport, skipping")
+                continue
             rotation = item.get('rotation')
             if rotation is None and data_dir:
-                from history_cartopy.river_alignment import get_river_angle
                 # Calculate label width for stretch-based angle
                 char_width_pts = river_fontsize * 0.6
                 label_width_pts = len(display_name) * char_width_pts
@@ -237,7 +281,6 @@ def collect_labels(gazetteer, manifest, placement_manager, data_dir=None):
                                            label_width_deg=label_width_deg)
 
             # Compute normal from rotation
-            from history_cartopy.river_alignment import angle_to_normal
             normal = angle_to_normal(rotation or 0)
 
             river_data.append({
@@ -260,8 +303,6 @@ def collect_labels(gazetteer, manifest, placement_manager, data_dir=None):
             )
         else:
             # Auto-placement: generate candidate positions
-            from history_cartopy.river_alignment import sample_river_positions
-
             # Calculate label width in degrees for stretch-based angle calculation
             char_width_pts = river_fontsize * 0.6
             label_width_pts = len(display_name) * char_width_pts
@@ -334,6 +375,9 @@ def collect_labels(gazetteer, manifest, placement_manager, data_dir=None):
     for item in labels.get('regions', []):
         lon, lat = item['coords']
         name = item['name']
+        if viewport_bbox and not _in_viewport(lon, lat, viewport_bbox, pad_deg):
+            logger.debug(f"Region '{name}' is outside the viewport, skipping")
+            continue
         display = item.get('display_as', name)
         rotation = item.get('rotation', 0)
 
@@ -347,8 +391,8 @@ def collect_labels(gazetteer, manifest, placement_manager, data_dir=None):
         logger.info(f"Region '{name}' collected at ({lon:.2f}, {lat:.2f}), rotation={rotation}")
         positions = []
         for x_off_pts, y_off_pts in region_shifts:
-            element = pm.add_label(
-                f"region_{name}_cand",
+            element = pm._build_label(
+                f"region_{name}",
                 (lon, lat),
                 display,
                 fontsize=region_fontsize,
@@ -359,10 +403,6 @@ def collect_labels(gazetteer, manifest, placement_manager, data_dir=None):
                 ha='center',
                 va='center',
             )
-            element.id = f"region_{name}"
-            element.ha = 'center'
-            element.va = 'center'
-            pm.remove(f"region_{name}_cand")
             positions.append(element)
 
         candidate = LabelCandidate(
@@ -396,11 +436,9 @@ def render_labels_resolved(ax, city_render_data, river_data, region_data,
         river_candidates: list of LabelCandidate for rivers (for debug rendering)
         debug_river_candidates: if True, render all river candidates instead of resolved
     """
-    from history_cartopy.styles import get_deg_per_pt
+    iconset_path = resolve_iconset_path(manifest, data_dir)
 
-    # Resolve iconset path
-    iconset_name = manifest.get('metadata', {}).get('iconset') or ICONSET.get('path', DEFAULT_ICONSET)
-    iconset_path = os.path.join(data_dir, iconset_name) if data_dir else None
+    dpp = get_deg_per_pt(ax)
 
     # Render Cities
     for city in city_render_data:
@@ -428,56 +466,16 @@ def render_labels_resolved(ax, city_render_data, river_data, region_data,
                         y_offset=city['icon_offset'][1])
 
         # Draw label at resolved position
-        label_id = f"city_label_{city['name']}"
-        if label_id in resolved_positions:
-            resolved = resolved_positions[label_id]
-            # The resolved element stores offset in degrees, but apply_text expects points
-            # We need to convert back, or use the offset stored on the element
-            # Actually, looking at PlacementElement, offset is stored in degrees
-            # But we track the pts offset in the positions list
-            # Let's get the offset from the PlacementElement
-            # offset is in degrees, so we need to convert to points
-            # But actually we stored x_offset_pts and y_offset_pts when creating the element
-            # The PlacementElement stores (x_offset_deg, y_offset_deg)
-            # We need to convert back: pts = deg / dpp
-            # But we don't have dpp here... let's think about this
-            #
-            # Actually, looking at the code again, the offset in PlacementElement is in degrees
-            # But apply_text expects points. We need to figure out the conversion.
-            #
-            # Looking at add_label():
-            #   x_offset_deg = x_offset_pts * self.dpp
-            # So to convert back: x_offset_pts = x_offset_deg / dpp
-            #
-            # But we don't have access to dpp here. We could:
-            # 1. Pass dpp to this function
-            # 2. Store the pts offset on the PlacementElement or in a separate field
-            #
-            # Let me look at how we can get this info. The cleanest approach is to
-            # store the point offsets somewhere. Since we're generating candidates,
-            # we can store both.
-            #
-            # Actually, looking more carefully at the collect_labels function I wrote,
-            # we create PlacementElements with add_label() which takes pts and converts to deg.
-            # The PlacementElement.offset is stored in degrees.
-            #
-            # For rendering, we need points. We could:
-            # - Compute offset from the bbox (which is in degrees) back to points
-            # - Or store point offsets in some metadata
-            # - Or compute dpp from the ax
-            #
-            # Let's compute dpp from ax and convert back.
-            dpp = get_deg_per_pt(ax)
+        resolved = resolved_positions.get(f"city_label_{city['name']}")
+        if resolved is not None:
+            # PlacementElement offsets are in degrees; apply_text expects points
             x_offset_pts = resolved.offset[0] / dpp
             y_offset_pts = resolved.offset[1] / dpp
 
-            # Use alignment from resolved element (stored during candidate generation)
-            ha = getattr(resolved, 'ha', 'left')
-            va = getattr(resolved, 'va', 'top')
-
+            # Alignment is stored on the element by add_label()
             apply_text(ax, lon, lat, city['display'], level_config['label_style'],
                        x_offset=x_offset_pts, y_offset=y_offset_pts,
-                       ha=ha, va=va)
+                       ha=resolved.ha, va=resolved.va)
         else:
             # Fallback: use manual offset if specified, otherwise default position
             if city['use_manual_offset']:
@@ -502,12 +500,11 @@ def render_labels_resolved(ax, city_render_data, river_data, region_data,
                    x_offset=x_offset_pts, y_offset=y_offset_pts)
 
     # Then render auto-placed rivers
-    dpp = get_deg_per_pt(ax)
     if debug_river_candidates and river_candidates:
         # Debug mode: render ALL candidate positions
         for candidate in river_candidates:
             for idx, pos in enumerate(candidate.positions):
-                rotation = getattr(pos, 'rotation', 0)
+                rotation = pos.rotation
                 x_offset_pts = pos.offset[0] / dpp if dpp else 0
                 y_offset_pts = pos.offset[1] / dpp if dpp else 0
                 # Use a lighter color for non-first candidates
@@ -520,7 +517,7 @@ def render_labels_resolved(ax, city_render_data, river_data, region_data,
         # Normal mode: render only resolved positions
         for label_id, resolved in resolved_positions.items():
             if resolved.type == 'river':
-                rotation = getattr(resolved, 'rotation', 0)
+                rotation = resolved.rotation
                 x_offset_pts = resolved.offset[0] / dpp if dpp else 0
                 y_offset_pts = resolved.offset[1] / dpp if dpp else 0
                 apply_text(ax, resolved.coords[0], resolved.coords[1],
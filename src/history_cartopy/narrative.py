@@ -8,7 +8,9 @@ and optional numbered/lettered circle markers on the map itself.
 import logging
 import textwrap
 
+import cartopy.crs as ccrs
 import matplotlib.patches as mpatches
+from matplotlib.collections import PatchCollection
 
 from history_cartopy.placement import PRIORITY
 
@@ -21,6 +23,28 @@ BORDER_WIDTH_PX = 100
 _MAP_AXES_FILL = 0.94
 _DPI = 300  # hardcoded DPI used by render_map.py
 
+# Above this many markers, circles are drawn as a single PatchCollection
+MARKER_COLLECTION_THRESHOLD = 50
+
+# Cache of wrapped paragraph text, keyed by (text, wrap_width).
+# Both the blocker estimate and the real render wrap the same strings.
+_wrap_cache = {}
+
+
+def _wrap_text(text, width):
+    """Wrap text to width characters, reusing previously wrapped results."""
+    cache_key = (text, width)
+    if cache_key in _wrap_cache:
+        return _wrap_cache[cache_key]
+    wrapped = textwrap.fill(text, width=width)
+    _wrap_cache[cache_key] = wrapped
+    return wrapped
+
+
+def clear_narrative_caches():
+    """Drop all cached wrapped narrative text."""
+    _wrap_cache.clear()
+
 
 def _resolve_item_coords(item, gazetteer):
     """Resolve lon/lat for a narrative item from coords or location."""
@@ -96,8 +120,6 @@ def render_narrative_markers(ax, manifest, gazetteer, narrative_style, bg_color,
     if not narrative:
         return
 
-    import cartopy.crs as ccrs
-
     items = narrative.get('items', [])
     marker_radius = narrative_style.get('marker_radius', 6)
     marker_color = narrative_style.get('marker_color', '#333333')
@@ -107,8 +129,27 @@ def render_narrative_markers(ax, manifest, gazetteer, narrative_style, bg_color,
 
     # Convert marker radius from points to degrees
     radius_deg = marker_radius * dpp
-    rendered = 0
+    data_crs = ccrs.PlateCarree()
+
+    # Shared kwargs, built once rather than per marker
+    circle_kwargs = dict(
+        radius=radius_deg,
+        facecolor=bg_color,
+        edgecolor=marker_color,
+        linewidth=marker_linewidth,
+        zorder=6,
+    )
+    text_kwargs = dict(
+        fontsize=label_fontsize,
+        fontweight='bold',
+        fontfamily=font_family,
+        color=marker_color,
+        ha='center', va='center',
+        transform=data_crs,
+        zorder=6.1,
+    )
 
+    circles = []
     for item in items:
         label = item.get('label')
         if not label or label is False:
@@ -119,30 +160,22 @@ def render_narrative_markers(ax, manifest, gazetteer, narrative_style, bg_color,
             continue
 
         lon, lat = coords
-
-        circle = mpatches.Circle(
-            (lon, lat), radius=radius_deg,
-            facecolor=bg_color,
-            edgecolor=marker_color,
-            linewidth=marker_linewidth,
-            transform=ccrs.PlateCarree(),
-            zorder=6,
-        )
-        ax.add_patch(circle)
-
-        ax.text(
-            lon, lat, str(label),
-            fontsize=label_fontsize,
-            fontweight='bold',
-            fontfamily=font_family,
-            color=marker_color,
-            ha='center', va='center',
-            transform=ccrs.PlateCarree(),
-            zorder=6.1,
-        )
-        rendered += 1
+        circles.append(mpatches.Circle((lon, lat), **circle_kwargs))
+        ax.text(lon, lat, str(label), **text_kwargs)
         logger.debug(f"Rendered narrative marker '{label}' at ({lon:.2f}, {lat:.2f})")
 
+    # Large marker sets are drawn as one collection instead of N patches
+    if len(circles) > MARKER_COLLECTION_THRESHOLD:
+        ax.add_collection(PatchCollection(
+            circles, match_original=True, zorder=6,
+            transform=data_crs,
+        ))
+    else:
+        for circle in circles:
+            circle.set_transform(data_crs)
+            ax.add_patch(circle)
+    rendered = len(circles)
+
     logger.info(f"Rendered {rendered} narrative marker(s)")
 
 
@@ -253,7 +286,7 @@ def render_narrative_box(overlay_ax, fig, map_ax, manifest, dimensions_px,
         else:
             prefix = ""
 
-        wrapped = textwrap.fill(prefix + text, width=computed_wrap_width)
+        wrapped = _wrap_text(prefix + text, computed_wrap_width)
         paragraphs.append({'text': wrapped})
 
     if not paragraphs:
@@ -266,7 +299,7 @@ def render_narrative_box(overlay_ax, fig, map_ax, manifest, dimensions_px,
     if reference_text:
         # Scale wrap width inversely with font size (smaller font = more chars per line)
         ref_wrap_width = max(20, int(computed_wrap_width * body_fontsize / ref_fontsize))
-        ref_wrapped = textwrap.fill(reference_text, width=ref_wrap_width)
+        ref_wrapped = _wrap_text(reference_text, ref_wrap_width)
 
     # Calculate paragraph heights from line count
     # Using line count * fontsize * linespacing is more reliable than
@@ -304,7 +337,6 @@ def render_narrative_box(overlay_ax, fig, map_ax, manifest, dimensions_px,
         # Convert lon/lat to overlay axes fraction
         # map_ax.transData converts data (lon/lat) -> display pixels
         # overlay_ax.transAxes.inverted() converts display pixels -> axes fraction
-        import cartopy.crs as ccrs
         lon, lat = exact_coords
         display_pt = map_ax.transData.transform((lon, lat))
         ax_frac = overlay_ax.transAxes.inverted().transform(display_pt)
@@ -333,20 +365,11 @@ def render_narrative_box(overlay_ax, fig, map_ax, manifest, dimensions_px,
                 else:
                     box_y = ty + th + stacking_gap
 
-    # Draw background
-    bg_rect = mpatches.FancyBboxPatch(
-        (box_x, box_y), box_w, box_h,
-        boxstyle="square,pad=0",
-        facecolor=bg_color, edgecolor='none',
-        transform=overlay_ax.transAxes, zorder=8.0,
-    )
-    overlay_ax.add_patch(bg_rect)
-
-    # Draw outer border
+    # Draw background and outer border as one patch (fill, then stroke)
     outer_rect = mpatches.FancyBboxPatch(
         (box_x, box_y), box_w, box_h,
         boxstyle="square,pad=0",
-        facecolor='none', edgecolor=line_color, linewidth=outer_lw,
+        facecolor=bg_color, edgecolor=line_color, linewidth=outer_lw,
         transform=overlay_ax.transAxes, zorder=8.1,
     )
     overlay_ax.add_patch(outer_rect)
@@ -402,13 +425,28 @@ def render_narrative_box(overlay_ax, fig, map_ax, manifest, dimensions_px,
         )
 
 
+# (vertical, horizontal) corner for each supported position string
+_CORNERS = {
+    'top-left':     ('top', 'left'),
+    'top-right':    ('top', 'right'),
+    'bottom-left':  ('bottom', 'left'),
+    'bottom-right': ('bottom', 'right'),
+}
+
+
+def _corner(pos):
+    """Map a position string to its (vertical, horizontal) corner."""
+    corner = _CORNERS.get(pos)
+    if corner is None:
+        # Non-canonical spelling (e.g. 'left-top'): fall back to substring checks
+        corner = ('top' if 'top' in pos else 'bottom',
+                  'left' if 'left' in pos else 'right')
+    return corner
+
+
 def _same_corner(pos1, pos2):
     """Check if two position strings refer to the same corner."""
-    def normalize(p):
-        v = 'top' if 'top' in p else 'bottom'
-        h = 'left' if 'left' in p else 'right'
-        return (v, h)
-    return normalize(pos1) == normalize(pos2)
+    return _corner(pos1) == _corner(pos2)
 
 
 def estimate_narrative_box_fracs(manifest, dimensions_px, cartouche_style,
@@ -458,7 +496,7 @@ def estimate_narrative_box_fracs(manifest, dimensions_px, cartouche_style,
             continue
         label = item.get('label')
         prefix = f"{label}. " if (label and label is not False) else ""
-        wrapped = textwrap.fill(prefix + text, width=wrap_w)
+        wrapped = _wrap_text(prefix + text, wrap_w)
         total_h += (wrapped.count('\n') + 1) * line_h
         n_paras += 1
     if n_paras > 1:
@@ -468,7 +506,7 @@ def estimate_narrative_box_fracs(manifest, dimensions_px, cartouche_style,
     if ref:
         ref_fs  = body_fs - 2
         ref_w   = max(20, int(wrap_w * body_fs / ref_fs))
-        ref_txt = textwrap.fill(ref, width=ref_w)
+        ref_txt = _wrap_text(ref, ref_w)
         total_h += para_gap + (ref_txt.count('\n') + 1) * ref_fs * 1.2 * pts2dpx
 
     box_h = (total_h + 2 * border_y_dpx) / ax_h
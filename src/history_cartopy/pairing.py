@@ -8,10 +8,12 @@ event labels expanded to 3 distance tiers (matching city candidates).
 
 import math
 import logging
-from copy import copy
+from dataclasses import replace
 
-from history_cartopy.placement import PairedLabelCandidate
-from history_cartopy.anchor import AnchorCircle
+import numpy as np
+
+from history_cartopy.placement import PairedLabelCandidate, _overlap_mask
+from history_cartopy.anchor import compute_candidate_offsets
 from history_cartopy.themes import EVENT_CONFIG, LABEL_STYLES
 
 logger = logging.getLogger('history_cartopy.pairing')
@@ -24,13 +26,78 @@ PAIR_THRESHOLD_PTS = 10
 
 
 def _haversine_km(lon1, lat1, lon2, lat2):
-    """Approximate great-circle distance in km between two lon/lat points."""
+    """
+    Approximate great-circle distance in km between lon/lat points.
+
+    Accepts scalars or equal-length arrays (element-wise distances).
+    """
     R = 6371
-    dlat = math.radians(lat2 - lat1)
-    dlon = math.radians(lon2 - lon1)
-    a = (math.sin(dlat / 2) ** 2
-         + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlon / 2) ** 2)
-    return R * 2 * math.asin(math.sqrt(a))
+    lat1, lat2 = np.radians(lat1), np.radians(lat2)
+    dlat = lat2 - lat1
+    dlon = np.radians(np.subtract(lon2, lon1))
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    return R * 2 * np.arcsin(np.sqrt(a))
+
+
+def _build_event_grid(event_coords, cell_deg):
+    """
+    Bucket event anchors into a uniform grid with cells of cell_deg.
+
+    With the cell size equal to the pairing threshold, every event within
+    threshold of a point lies in that point's cell or one of its 8 neighbours.
+
+    Args:
+        event_coords: List of (lon, lat) or None (for events without positions)
+        cell_deg: Grid cell size in degrees
+
+    Returns:
+        Dict mapping (col, row) -> list of indices into event_coords
+    """
+    grid = {}
+    for idx, coords in enumerate(event_coords):
+        if coords is None:
+            continue
+        cell = (math.floor(coords[0] / cell_deg), math.floor(coords[1] / cell_deg))
+        grid.setdefault(cell, []).append(idx)
+    return grid
+
+
+def _nearby_events(grid, coords, cell_deg):
+    """Indices of events in the 3x3 grid cells around coords, in input order."""
+    col = math.floor(coords[0] / cell_deg)
+    row = math.floor(coords[1] / cell_deg)
+    nearby = []
+    for dc in (-1, 0, 1):
+        for dr in (-1, 0, 1):
+            nearby.extend(grid.get((col + dc, row + dr), ()))
+    nearby.sort()
+    return nearby
+
+
+def _disjoint_matrix(a, b):
+    """
+    Pairwise non-intersection test between two sets of bounding boxes.
+
+    Negated placement._overlap_mask(), with an envelope prune: rows of
+    a that miss the envelope of all of b are disjoint from every b[j] and
+    skip the pairwise comparison.
+
+    Args:
+        a: (N, 4) array of (x1, y1, x2, y2) bboxes
+        b: (M, 4) array of (x1, y1, x2, y2) bboxes
+
+    Returns:
+        (N, M) bool array, True where a[i] and b[j] do not intersect
+    """
+    env_x1, env_y1 = b[:, 0].min(), b[:, 1].min()
+    env_x2, env_y2 = b[:, 2].max(), b[:, 3].max()
+    near = ~((a[:, 2] < env_x1) | (a[:, 0] > env_x2) |
+             (a[:, 3] < env_y1) | (a[:, 1] > env_y2))
+
+    disjoint = np.ones((len(a), len(b)), dtype=bool)
+    if near.any():
+        disjoint[near] = ~_overlap_mask(a[near], b)
+    return disjoint
 
 
 def _make_event_positions_3tier(event_cand, event_subtext, event_subtext_fontsize, pm):
@@ -50,42 +117,28 @@ def _make_event_positions_3tier(event_cand, event_subtext, event_subtext_fontsiz
     event_lon, event_lat = event_cand.positions[0].coords
     event_text = event_cand.positions[0].text
 
-    anchor = AnchorCircle(city_level=2)
-    anchor.radius = event_anchor_radius
-
-    positions = []
-    distance_multipliers = [1.0, 1.3, 1.6]
-
-    for multiplier in distance_multipliers:
+    all_offsets = []
+    for multiplier in (1.0, 1.3, 1.6):
         extra_gap = event_anchor_radius * (multiplier - 1.0)
-        candidate_offsets = anchor.get_candidate_offsets(
-            gap_pts=extra_gap, text_height_pts=event_fontsize
+        all_offsets.extend(
+            (x_off, y_off, ha, va)
+            for _, x_off, y_off, ha, va in compute_candidate_offsets(event_anchor_radius + extra_gap)
         )
-        for pos_name, x_off, y_off, ha, va in candidate_offsets:
-            tier_suffix = f"_t{int(multiplier * 10)}"
-            temp_id = f"pair_evt_{event_cand.id}_{pos_name}{tier_suffix}"
-            element = pm.add_label(
-                temp_id,
-                (event_lon, event_lat),
-                event_text,
-                fontsize=event_fontsize,
-                x_offset_pts=x_off,
-                y_offset_pts=y_off,
-                priority=event_cand.priority,
-                element_type='event_label',
-                group=event_cand.group,
-                ha=ha,
-                va=va,
-                subtext=event_subtext,
-                subtext_fontsize=event_subtext_fontsize if event_subtext else None,
-            )
-            element.id = event_cand.id   # Preserve original ID for resolved_positions lookup
-            element.ha = ha
-            element.va = va
-            pm.remove(temp_id)
-            positions.append(element)
 
-    return positions
+    # Built outside the registry: these are candidates, not placed elements.
+    # The original ID is kept for resolved_positions lookup.
+    return pm._build_labels(
+        event_cand.id,
+        (event_lon, event_lat),
+        event_text,
+        fontsize=event_fontsize,
+        offsets=all_offsets,
+        priority=event_cand.priority,
+        element_type='event_label',
+        group=event_cand.group,
+        subtext=event_subtext,
+        subtext_fontsize=event_subtext_fontsize if event_subtext else None,
+    )
 
 
 def detect_and_pair(city_candidates, event_candidates, event_render_data, pm,
@@ -110,6 +163,12 @@ def detect_and_pair(city_candidates, event_candidates, event_render_data, pm,
     """
     threshold_deg = threshold_pts * pm.dpp
 
+    # Nothing can pair: skip the lookup and index setup entirely
+    if not city_candidates or not event_candidates or threshold_deg <= 0:
+        return [], list(city_candidates), list(event_candidates)
+
+    threshold_sq = threshold_deg * threshold_deg  # compare squared distances, no sqrt
+
     # Build subtext lookup from event render data
     subtext_lookup = {}   # event_id -> (subtext, subtext_fontsize)
     subtext_fontsize = LABEL_STYLES.get('event_subtext', {}).get('fontsize', 7)
@@ -119,33 +178,41 @@ def detect_and_pair(city_candidates, event_candidates, event_render_data, pm,
             subtext_fontsize,
         )
 
-    paired_city_ids = set()
-    paired_event_ids = set()
+    # Per-event anchor and bare event ID, read once rather than per city probe.
+    # Candidate IDs have the format "event_text_{event_id}".
+    event_anchors = [ec.positions[0].coords if ec.positions else None
+                     for ec in event_candidates]
+    event_ids = [ec.id.replace('event_text_', '', 1) for ec in event_candidates]
+
+    # Spatial index over event anchors so each city only looks at nearby events
+    event_grid = _build_event_grid(event_anchors, threshold_deg)
+    # Paired flags by position; the remaining lists are read off these at the end
+    used_event = [False] * len(event_candidates)
+    used_city = [False] * len(city_candidates)
+
     paired_candidates = []
+    pair_log = []   # (city_id, event_id, dist_deg, city_coords, event_coords, n_pairs)
 
-    for city_cand in city_candidates:
+    for city_idx, city_cand in enumerate(city_candidates):
         if not city_cand.positions:
             continue
         city_coords = city_cand.positions[0].coords  # (lon, lat)
 
-        for event_cand in event_candidates:
-            if event_cand.id in paired_event_ids:
-                continue
-            if not event_cand.positions:
+        for event_idx in _nearby_events(event_grid, city_coords, threshold_deg):
+            if used_event[event_idx]:
                 continue
+            event_cand = event_candidates[event_idx]
 
-            event_coords = event_cand.positions[0].coords  # (lon, lat)
-            dist = math.sqrt(
-                (city_coords[0] - event_coords[0]) ** 2 +
-                (city_coords[1] - event_coords[1]) ** 2
-            )
+            event_coords = event_anchors[event_idx]  # (lon, lat)
+            dx = city_coords[0] - event_coords[0]
+            dy = city_coords[1] - event_coords[1]
+            dist_sq = dx * dx + dy * dy
 
-            if dist >= threshold_deg:
+            if dist_sq >= threshold_sq:
                 continue
 
-            # Extract event ID from candidate ID (format: "event_text_{event_id}")
-            event_id = event_cand.id.replace('event_text_', '', 1)
-            event_subtext, event_subtext_fontsize = subtext_lookup.get(event_id, ('', subtext_fontsize))
+            event_subtext, event_subtext_fontsize = subtext_lookup.get(
+                event_ids[event_idx], ('', subtext_fontsize))
 
             # Generate 3-tier event positions
             event_positions = _make_event_positions_3tier(
@@ -155,20 +222,24 @@ def detect_and_pair(city_candidates, event_candidates, event_render_data, pm,
             # Build all (city, event) pairs where the two bboxes don't intersect.
             # City positions: indices 0-7 = tier 1 (1.0x), 8-15 = tier 2 (1.3x), 16-23 = tier 3 (1.6x)
             paired_group = f"paired_{city_cand.id}_{event_cand.id}"
-            paired_positions = []
-            fallback_idx = None  # First pair from city 1.3x tier
-
-            for city_idx, city_elem in enumerate(city_cand.positions):
-                for event_elem in event_positions:
-                    if pm._bbox_intersects(city_elem.bbox, event_elem.bbox):
-                        continue
-                    c = copy(city_elem)
-                    e = copy(event_elem)
-                    c.group = paired_group
-                    e.group = paired_group
-                    if fallback_idx is None and city_idx >= 8:
-                        fallback_idx = len(paired_positions)  # First pair in 1.3x city tier
-                    paired_positions.append([c, e])
+            city_bboxes = np.array([p.bbox for p in city_cand.positions])
+            event_bboxes = np.array([p.bbox for p in event_positions])
+            disjoint = _disjoint_matrix(city_bboxes, event_bboxes)
+
+            # nonzero is row-major, so pairs keep city-major, event-minor order
+            city_rows, event_cols = np.nonzero(disjoint)
+
+            # First pair in the 1.3x city tier
+            first_t2 = int(np.searchsorted(city_rows, 8))
+            fallback_idx = first_t2 if first_t2 < len(city_rows) else None
+
+            # Regroup each position once; pairs share these (read-only) elements
+            city_regrouped = [replace(p, group=paired_group) for p in city_cand.positions]
+            event_regrouped = [replace(p, group=paired_group) for p in event_positions]
+            paired_positions = [
+                [city_regrouped[city_pos_idx], event_regrouped[event_pos_idx]]
+                for city_pos_idx, event_pos_idx in zip(city_rows.tolist(), event_cols.tolist())
+            ]
 
             if not paired_positions:
                 logger.warning(
@@ -186,17 +257,25 @@ def detect_and_pair(city_candidates, event_candidates, event_render_data, pm,
                 fallback_idx=fallback_idx if fallback_idx is not None else 0,
             )
             paired_candidates.append(paired_cand)
-            paired_city_ids.add(city_cand.id)
-            paired_event_ids.add(event_cand.id)
+            used_event[event_idx] = True
+            used_city[city_idx] = True
 
-            dist_km = _haversine_km(city_coords[0], city_coords[1], event_coords[0], event_coords[1])
+            pair_log.append((city_cand.id, event_cand.id, math.sqrt(dist_sq), city_coords, event_coords,
+                             len(paired_positions)))
+            break  # Each city pairs with at most one event
+
+    if pair_log:
+        # Distances are only needed for logging: compute them in one batch
+        city_ll = np.array([entry[3] for entry in pair_log])
+        event_ll = np.array([entry[4] for entry in pair_log])
+        dists_km = _haversine_km(city_ll[:, 0], city_ll[:, 1], event_ll[:, 0], event_ll[:, 1])
+        for (city_id, event_id, dist, _, _, n_pairs), dist_km in zip(pair_log, dists_km):
             logger.info(
-                f"Paired '{city_cand.id}' + '{event_cand.id}' "
-                f"(dist={dist / pm.dpp:.0f}pt, ~{dist_km:.0f}km, {len(paired_positions)} position pairs)"
+                f"Paired '{city_id}' + '{event_id}' "
+                f"(dist={dist / pm.dpp:.0f}pt, ~{dist_km:.0f}km, {n_pairs} position pairs)"
             )
-            break  # Each city pairs with at most one event
 
-    remaining_city = [c for c in city_candidates if c.id not in paired_city_ids]
-    remaining_event = [c for c in event_candidates if c.id not in paired_event_ids]
+    remaining_city = [c for c, used in zip(city_candidates, used_city) if not used]
+    remaining_event = [ec for ec, used in zip(event_candidates, used_event) if not used]
 
     return paired_candidates, remaining_city, remaining_event
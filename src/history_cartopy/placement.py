@@ -7,11 +7,37 @@ using bounding box intersection.
 
 import logging
 import math
-from dataclasses import dataclass
-from typing import Optional
+import sys
+from dataclasses import dataclass, field
+from functools import lru_cache
+from operator import attrgetter
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+import shapely
 
 logger = logging.getLogger('history_cartopy.placement')
 
+# detect_overlaps() strategy by number of live elements: up to
+# DENSE_OVERLAP_MAX, one dense NumPy broadcast over all pairs; up to
+# SWEEP_OVERLAP_MAX, a vectorized sweep along x; beyond that, an STRtree.
+DENSE_OVERLAP_MAX = 64
+SWEEP_OVERLAP_MAX = 2000
+
+# Upper bound on candidate pairs the sweep materializes at once
+SWEEP_CHUNK_PAIRS = 1 << 22
+
+# would_overlap() scans the bbox buffer linearly until it holds this many rows;
+# beyond that, it looks rows up in a uniform grid of GRID_CELL_PTS cells
+# (about four label line heights). Elements spanning more than GRID_MAX_CELLS
+# cells are kept in a side list that every query scans.
+INDEX_MIN_ROWS = 512
+GRID_CELL_PTS = 48
+GRID_MAX_CELLS = 64
+
+# Slotted dataclasses (no per-instance __dict__) need Python 3.10+
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
 
 # Priority levels for different element types
 # Higher priority = placed first, keeps preferred position
@@ -38,7 +64,174 @@ PRIORITY = {
 }
 
 
-@dataclass
+def _blocks(element, existing):
+    """
+    Whether existing, with a bbox intersecting element's, blocks element.
+
+    Same-group elements are filtered out before this (by group code). Region
+    labels are semi-transparent decorative text:
+    - Non-region elements don't need to avoid regions
+    - Region elements only avoid capital city dots/labels and map boxes
+    map_box (title cartouche, narrative box) only blocks regions, not other labels.
+    """
+    if existing.type == 'region':
+        return False  # regions never block other elements
+    if element.type != 'region':
+        return existing.type != 'map_box'  # map_box only matters for region placement
+    return existing.type in ('city_level_1', 'city_label_1', 'map_box')  # regions avoid capitals and map boxes
+
+
+@lru_cache(maxsize=1024)
+def _rotation_trig(rotation):
+    """
+    (cos, sin) of a rotation in degrees.
+
+    Cached: the labels along one campaign segment (above, below, swapped)
+    and repeated river candidates share their rotations exactly.
+    """
+    rad = math.radians(rotation)
+    return math.cos(rad), math.sin(rad)
+
+
+def _letter_bboxes(center, rotation, text, char_width_deg, text_height_deg):
+    """
+    Per-letter bboxes of a label rotated about its center.
+
+    Each character is a char_width_deg x text_height_deg cell laid along the
+    rotated baseline, bounded by its own AABB. Whitespace gets no box.
+
+    Returns:
+        (L, 4) array of (x1, y1, x2, y2), one row per non-whitespace character
+    """
+    cos_r, sin_r = _rotation_trig(rotation)
+    letters = np.array([i for i, ch in enumerate(text) if not ch.isspace()], dtype=float)
+    along = (letters + 0.5 - len(text) / 2) * char_width_deg
+    cx = center[0] + along * cos_r
+    cy = center[1] + along * sin_r
+    half_w = (char_width_deg * abs(cos_r) + text_height_deg * abs(sin_r)) / 2
+    half_h = (char_width_deg * abs(sin_r) + text_height_deg * abs(cos_r)) / 2
+    return np.column_stack((cx - half_w, cy - half_h, cx + half_w, cy + half_h))
+
+
+def _letters_intersect(a, b, a_box=None, b_box=None):
+    """
+    Refine a bbox hit between two elements using per-letter bboxes.
+
+    Elements without sub_bboxes stand in as their single bbox, taken from
+    a_box / b_box when given: (1, 4) arrays, typically views of the
+    element's row in the bbox buffer, which saves packing the bbox tuple.
+    Only call this after the coarse bbox test has passed.
+    """
+    if a.sub_bboxes is None and b.sub_bboxes is None:
+        return True
+    if a.sub_bboxes is not None:
+        a_box = a.sub_bboxes
+    elif a_box is None:
+        a_box = np.array([a.bbox])
+    if b.sub_bboxes is not None:
+        b_box = b.sub_bboxes
+    elif b_box is None:
+        b_box = np.array([b.bbox])
+    return bool(_overlap_mask(a_box, b_box).any())
+
+
+def _overlap_rows(bbox, boxes):
+    """
+    Indices of the rows of boxes that intersect bbox.
+
+    Array form of PlacementManager._bbox_intersects() for one query
+    against an (N, 4) array.
+    NaN rows never match.
+    """
+    ex1, ey1, ex2, ey2 = bbox
+    x1, y1, x2, y2 = boxes.T
+    return np.flatnonzero((x2 >= ex1) & (x1 <= ex2) & (y2 >= ey1) & (y1 <= ey2))
+
+
+def _overlap_mask(a, b):
+    """
+    Pairwise intersection test between two sets of bounding boxes.
+
+    Array form of PlacementManager._bbox_intersects() for (N, 4) against
+    (M, 4) arrays.
+
+    Returns:
+        (N, M) bool array, True where a[i] and b[j] intersect
+    """
+    return ((a[:, None, 2] >= b[None, :, 0]) & (a[:, None, 0] <= b[None, :, 2]) &
+            (a[:, None, 3] >= b[None, :, 1]) & (a[:, None, 1] <= b[None, :, 3]))
+
+
+def _sweep_pairs(boxes):
+    """
+    All intersecting pairs among (N, 4) boxes, via a sweep along x.
+
+    Boxes are sorted by x1. The boxes that can meet box i further along the
+    sweep are exactly those whose x1 falls within [x1_i, x2_i], a contiguous
+    window found by binary search; the windows are expanded into candidate
+    pairs in bounded chunks and the y intervals checked in bulk.
+
+    Returns:
+        (left, right) index arrays into boxes with left < right, unordered
+    """
+    order = np.argsort(boxes[:, 0], kind='stable')
+    x1, y1, x2, y2 = boxes[order].T
+    n = len(order)
+    starts = np.arange(1, n + 1)
+    ends = np.searchsorted(x1, x2, side='right')
+    counts = np.maximum(ends - starts, 0)
+
+    lefts, rights = [], []
+    bounds = np.cumsum(counts)
+    first = 0
+    while first < n:
+        # Rows [first, last) hold at most SWEEP_CHUNK_PAIRS pairs (or one row)
+        base = bounds[first - 1] if first else 0
+        last = max(int(np.searchsorted(bounds, base + SWEEP_CHUNK_PAIRS, side='right')), first + 1)
+        rows = np.arange(first, last)
+        row_counts = counts[first:last]
+        i = np.repeat(rows, row_counts)
+        # Position of each pair within its row's window
+        within = np.arange(len(i)) - np.repeat(np.cumsum(row_counts) - row_counts, row_counts)
+        j = starts[i] + within
+        hit = (y2[i] >= y1[j]) & (y1[i] <= y2[j])
+        lefts.append(order[i[hit]])
+        rights.append(order[j[hit]])
+        first = last
+
+    left = np.concatenate(lefts)
+    right = np.concatenate(rights)
+    return np.minimum(left, right), np.maximum(left, right)
+
+
+def _segment_path(path, padding, segment_length):
+    """
+    Split a path into runs of segment_length steps and bound each run.
+
+    Consecutive runs share their boundary point. Per-run extremes come from
+    one reduceat pass over the points, topped up with each run's end point.
+
+    Args:
+        path: Sequence of (lon, lat) points (at least 2)
+        padding: Margin added on every side of each bbox, in degrees
+        segment_length: Number of points per segment
+
+    Returns:
+        (starts, bboxes, mids): run start indices (S,), padded
+        (x1, y1, x2, y2) bboxes (S, 4) and run midpoints (S, 2)
+    """
+    pts = np.asarray(path, dtype=float)
+    starts = np.arange(0, len(pts) - 1, segment_length)
+    ends = np.minimum(starts + segment_length + 1, len(pts))
+    last = pts[ends - 1]
+    lo = np.minimum(np.minimum.reduceat(pts, starts), last)
+    hi = np.maximum(np.maximum.reduceat(pts, starts), last)
+    bboxes = np.hstack((lo - padding, hi + padding))
+    mids = pts[starts + (ends - starts) // 2]
+    return starts, bboxes, mids
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class LabelCandidate:
     """A label with multiple candidate positions for greedy resolution."""
     id: str
@@ -46,7 +239,7 @@ class LabelCandidate:
     priority: int
     group: Optional[str]
     # The different positions this label could take (in preference order)
-    positions: list  # list[PlacementElement]
+    positions: Sequence  # list or tuple of PlacementElement
     # After resolution
     resolved_idx: int = -1  # Which position was chosen (-1 = not resolved)
     fallback_idx: int = 0   # Position to use if all positions conflict
@@ -59,7 +252,7 @@ class LabelCandidate:
         return self.positions[self.resolved_idx]
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class PairedLabelCandidate:
     """Two co-located labels (city + nearby event) placed cooperatively.
 
@@ -82,7 +275,7 @@ class PairedLabelCandidate:
         return self.positions[self.resolved_idx]
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class ArrowCandidate:
     """A campaign arrow with multiple gap distance options."""
     id: str
@@ -117,7 +310,7 @@ class ArrowCandidate:
         return self.variants[self.resolved_idx]['geometry']
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class PlacementElement:
     """Represents a placed label or icon on the map."""
     id: str
@@ -128,6 +321,17 @@ class PlacementElement:
     priority: int
     text: Optional[str] = None  # For labels
     group: Optional[str] = None  # Group ID - elements in same group don't count as overlapping
+    ha: str = 'left'    # Text alignment used for rendering labels
+    va: str = 'center'
+    # Rotated labels (rivers, campaigns)
+    rotation: float = 0
+    normal: Optional[tuple] = None  # (nx, ny) unit normal for the label offset
+    gap_pts: float = 0
+    # Campaign labels: which path segment, and whether above/below are swapped
+    segment_idx: Optional[int] = None
+    is_swapped: bool = False
+    # Rotated labels: (L, 4) per-letter bboxes; bbox stays their union's AABB
+    sub_bboxes: Optional[np.ndarray] = field(default=None, compare=False, repr=False)
 
     @property
     def center(self):
@@ -146,15 +350,54 @@ class PlacementManager:
         pm.log_overlaps()
     """
 
-    def __init__(self, dpp: float):
+    def __init__(self, dpp: float, bbox_dtype=np.float32):
         """
         Initialize placement manager.
 
         Args:
             dpp: Degrees per point - for converting point offsets to degrees
+            bbox_dtype: Float type of the bbox buffer used for overlap tests.
+                float32 (~1e-5 deg at continental longitudes) is far finer than
+                a point; pass np.float64 for exact agreement with element.bbox.
         """
         self.dpp = dpp
         self.elements: dict[str, PlacementElement] = {}
+        # Struct-of-arrays mirror of element bboxes for vectorized overlap tests.
+        # Rows are appended in insertion order; a removed element leaves a dead
+        # row (id None, bbox NaN) behind until the buffer is next compacted.
+        # Capacity doubles when the buffer fills with mostly live rows.
+        self._bbox_arr = np.empty((64, 4), dtype=bbox_dtype)
+        self._row_ids: list[Optional[str]] = []
+        # Element per row (None when dead), so overlap hits map straight
+        # from row numbers to elements without a dict lookup by id
+        self._row_elems: list[Optional[PlacementElement]] = []
+        self._rows: dict[str, int] = {}
+        # Parallel column of interned group codes (-1 = ungrouped)
+        self._group_arr = np.empty(64, dtype=np.int32)
+        self._group_codes: dict[str, int] = {}
+        # Uniform grid: (col, row) cell -> buffer rows, built lazily by
+        # _query_rows() and kept up to date on insert; removals are filtered
+        # out at query time (dead rows are NaN)
+        self._grid: Optional[dict] = None
+        self._grid_big: list[int] = []
+        self._grid_cell = GRID_CELL_PTS * dpp
+        # detect_overlaps() result as (rows checked, left rows, right rows)
+        self._overlap_cache: Optional[tuple] = None
+        self._text_metric_cache: dict[tuple, tuple] = {}
+
+    def _text_metrics(self, fontsize: float) -> tuple:
+        """
+        Approximate (character width, line height) in degrees for a font size.
+
+        Average character width is fontsize * 0.6 and line height fontsize * 1.2
+        points. Memoized per (fontsize, dpp), so callers only scale by len(text).
+        """
+        key = (fontsize, self.dpp)
+        metrics = self._text_metric_cache.get(key)
+        if metrics is None:
+            metrics = self._text_metric_cache[key] = (fontsize * 0.6 * self.dpp,
+                                                      fontsize * 1.2 * self.dpp)
+        return metrics
 
     def add_label(
         self,
@@ -190,21 +433,59 @@ class PlacementManager:
             subtext: Optional second line of text (e.g. event date)
             subtext_fontsize: Font size for subtext in points
         """
-        # Approximate text dimensions in points
-        char_width = fontsize * 0.6  # Average character width
-        text_width_pts = len(text) * char_width
-        text_height_pts = fontsize * 1.2
+        element = self._build_label(
+            id, coords, text, fontsize,
+            x_offset_pts=x_offset_pts,
+            y_offset_pts=y_offset_pts,
+            priority=priority,
+            element_type=element_type,
+            group=group,
+            ha=ha,
+            va=va,
+            subtext=subtext,
+            subtext_fontsize=subtext_fontsize,
+        )
+        self._register(id, element)
+        logger.debug(f"Added label '{id}': {text} at {coords}")
+        return element
+
+    def _build_label(
+        self,
+        id: str,
+        coords: tuple,
+        text: str,
+        fontsize: float,
+        x_offset_pts: float = 0,
+        y_offset_pts: float = 0,
+        priority: int = 50,
+        element_type: str = 'city_label',
+        group: str = None,
+        ha: str = 'left',
+        va: str = 'center',
+        subtext: str = None,
+        subtext_fontsize: float = None,
+    ) -> PlacementElement:
+        """
+        Build a label element without registering it.
+
+        Same arguments as add_label(). Used for throwaway candidate positions
+        that would otherwise be added and immediately removed again.
+        """
+        dpp = self.dpp
+
+        # Approximate text dimensions in degrees
+        char_width_deg, text_height_deg = self._text_metrics(fontsize)
+        text_width_deg = len(text) * char_width_deg
 
         # Widen bbox to accommodate subtext if it is wider than the main text
-        if subtext and subtext_fontsize:
-            sub_width_pts = len(subtext) * subtext_fontsize * 0.6
-            text_width_pts = max(text_width_pts, sub_width_pts)
+        has_subtext = subtext and subtext_fontsize
+        if has_subtext:
+            sub_char_width_deg, sub_height_deg = self._text_metrics(subtext_fontsize)
+            text_width_deg = max(text_width_deg, len(subtext) * sub_char_width_deg)
 
         # Convert to degrees
-        x_offset_deg = x_offset_pts * self.dpp
-        y_offset_deg = y_offset_pts * self.dpp
-        text_width_deg = text_width_pts * self.dpp
-        text_height_deg = text_height_pts * self.dpp
+        x_offset_deg = x_offset_pts * dpp
+        y_offset_deg = y_offset_pts * dpp
 
         # Anchor point is at coords + offset
         anchor_x = coords[0] + x_offset_deg
@@ -219,8 +500,9 @@ class PlacementManager:
             x1 = anchor_x - text_width_deg
             x2 = anchor_x
         else:  # center
-            x1 = anchor_x - text_width_deg / 2
-            x2 = anchor_x + text_width_deg / 2
+            half_w = text_width_deg / 2
+            x1 = anchor_x - half_w
+            x2 = anchor_x + half_w
 
         # Vertical: anchor point is at top/center/bottom of text
         if va == 'bottom':
@@ -230,34 +512,107 @@ class PlacementManager:
             y1 = anchor_y - text_height_deg
             y2 = anchor_y
         else:  # center
-            y1 = anchor_y - text_height_deg / 2
-            y2 = anchor_y + text_height_deg / 2
+            half_h = text_height_deg / 2
+            y1 = anchor_y - half_h
+            y2 = anchor_y + half_h
 
         # Extend bbox downward to cover subtext, which is rendered below the main text
-        if subtext and subtext_fontsize:
-            line_height_deg = (fontsize + 2) * self.dpp   # gap between text centres
-            sub_half_deg = subtext_fontsize * 1.2 / 2 * self.dpp
-            subtext_bottom = anchor_y - line_height_deg - sub_half_deg
+        if has_subtext:
+            line_height_deg = (fontsize + 2) * dpp   # gap between text centres
+            subtext_bottom = anchor_y - line_height_deg - sub_height_deg / 2
             y1 = min(y1, subtext_bottom)
 
         # Add padding to create breathing room between labels and nearby dots
-        padding_deg = 2 * self.dpp  # 2 points of inter-element breathing room
-        bbox = (x1 - padding_deg, y1 - padding_deg, x2 + padding_deg, y2 + padding_deg)
+        padding_deg = 2 * dpp  # 2 points of inter-element breathing room
 
-        element = PlacementElement(
+        return PlacementElement(
             id=id,
             type=element_type,
             coords=coords,
             offset=(x_offset_deg, y_offset_deg),
-            bbox=bbox,
+            bbox=(x1 - padding_deg, y1 - padding_deg, x2 + padding_deg, y2 + padding_deg),
             priority=priority,
             text=text,
             group=group,
+            ha=ha,
+            va=va,
         )
 
-        self.elements[id] = element
-        logger.debug(f"Added label '{id}': {text} at {coords}")
-        return element
+    def _build_labels(
+        self,
+        id: str,
+        coords: tuple,
+        text: str,
+        fontsize: float,
+        offsets: Sequence,
+        priority: int = 50,
+        element_type: str = 'city_label',
+        group: str = None,
+        subtext: str = None,
+        subtext_fontsize: float = None,
+    ) -> list[PlacementElement]:
+        """
+        Build one unregistered label element per offset, with vectorized bboxes.
+
+        Equivalent to calling _build_label() once per (x_offset_pts,
+        y_offset_pts, ha, va) in offsets, but the bbox arithmetic for all
+        positions is done in a single pass of array operations.
+        """
+        dpp = self.dpp
+        x_off, y_off, ha, va = zip(*offsets)
+
+        # Approximate text dimensions in degrees
+        char_width_deg, text_height_deg = self._text_metrics(fontsize)
+        text_width_deg = len(text) * char_width_deg
+        has_subtext = subtext and subtext_fontsize
+        if has_subtext:
+            sub_char_width_deg, sub_height_deg = self._text_metrics(subtext_fontsize)
+            text_width_deg = max(text_width_deg, len(subtext) * sub_char_width_deg)
+
+        x_offset_deg = np.array(x_off) * dpp
+        y_offset_deg = np.array(y_off) * dpp
+        anchor_x = coords[0] + x_offset_deg
+        anchor_y = coords[1] + y_offset_deg
+        ha = np.array(ha)
+        va = np.array(va)
+
+        # Same alignment rules as _build_label(), selected per position
+        half_w = text_width_deg / 2
+        x1 = np.select([ha == 'left', ha == 'right'],
+                       [anchor_x, anchor_x - text_width_deg], anchor_x - half_w)
+        x2 = np.select([ha == 'left', ha == 'right'],
+                       [anchor_x + text_width_deg, anchor_x], anchor_x + half_w)
+        half_h = text_height_deg / 2
+        y1 = np.select([va == 'bottom', va == 'top'],
+                       [anchor_y, anchor_y - text_height_deg], anchor_y - half_h)
+        y2 = np.select([va == 'bottom', va == 'top'],
+                       [anchor_y + text_height_deg, anchor_y], anchor_y + half_h)
+
+        if has_subtext:
+            line_height_deg = (fontsize + 2) * dpp
+            y1 = np.minimum(y1, anchor_y - line_height_deg - sub_height_deg / 2)
+
+        padding_deg = 2 * dpp
+        bboxes = np.column_stack((x1 - padding_deg, y1 - padding_deg,
+                                  x2 + padding_deg, y2 + padding_deg)).tolist()
+
+        return [
+            PlacementElement(
+                id=id,
+                type=element_type,
+                coords=coords,
+                offset=offset,
+                bbox=tuple(bbox),
+                priority=priority,
+                text=text,
+                group=group,
+                ha=h,
+                va=v,
+            )
+            for offset, bbox, h, v in zip(
+                zip(x_offset_deg.tolist(), y_offset_deg.tolist()), bboxes,
+                ha.tolist(), va.tolist())
+        ]
 
     def add_icon(
         self,
@@ -284,19 +639,20 @@ class PlacementManager:
             group: Group ID - elements in same group don't count as overlapping
         """
         # Convert to degrees
-        x_offset_deg = x_offset_pts * self.dpp
-        y_offset_deg = y_offset_pts * self.dpp
-        icon_size_deg = size_pts * self.dpp
+        dpp = self.dpp
+        x_offset_deg = x_offset_pts * dpp
+        y_offset_deg = y_offset_pts * dpp
+        half_size_deg = size_pts * dpp / 2
 
         # Calculate bbox (icon centered at offset point)
         center_x = coords[0] + x_offset_deg
         center_y = coords[1] + y_offset_deg
 
         bbox = (
-            center_x - icon_size_deg / 2,  # x1
-            center_y - icon_size_deg / 2,  # y1
-            center_x + icon_size_deg / 2,  # x2
-            center_y + icon_size_deg / 2,  # y2
+            center_x - half_size_deg,  # x1
+            center_y - half_size_deg,  # y1
+            center_x + half_size_deg,  # x2
+            center_y + half_size_deg,  # y2
         )
 
         element = PlacementElement(
@@ -309,7 +665,7 @@ class PlacementManager:
             group=group,
         )
 
-        self.elements[id] = element
+        self._register(id, element)
         logger.debug(f"Added icon '{id}' at {coords}")
         return element
 
@@ -331,13 +687,13 @@ class PlacementManager:
             priority: Higher = more important
             group: Group ID - elements in same group don't count as overlapping
         """
-        dot_size_deg = size_pts * self.dpp
+        half_size_deg = size_pts * self.dpp / 2
 
         bbox = (
-            coords[0] - dot_size_deg / 2,
-            coords[1] - dot_size_deg / 2,
-            coords[0] + dot_size_deg / 2,
-            coords[1] + dot_size_deg / 2,
+            coords[0] - half_size_deg,
+            coords[1] - half_size_deg,
+            coords[0] + half_size_deg,
+            coords[1] + half_size_deg,
         )
 
         element = PlacementElement(
@@ -350,9 +706,45 @@ class PlacementManager:
             group=group,
         )
 
-        self.elements[id] = element
+        self._register(id, element)
         return element
 
+    def add_dots(
+        self,
+        ids: Sequence,
+        coords: Sequence,
+        sizes_pts: Sequence,
+        priorities: Sequence,
+        groups: Sequence,
+    ) -> list[PlacementElement]:
+        """
+        Add many city dot elements at once.
+
+        Equivalent to calling add_dot() for each (id, coords, size_pts,
+        priority, group), but the bboxes are computed with array operations
+        and copied into the overlap buffer in a single block.
+        """
+        if not ids:
+            return []
+        xy = np.asarray(coords, dtype=float).reshape(-1, 2)
+        half_size_deg = np.asarray(sizes_pts, dtype=float) * self.dpp / 2
+        bboxes = np.column_stack((xy - half_size_deg[:, None], xy + half_size_deg[:, None]))
+
+        elements = [
+            PlacementElement(
+                id=id,
+                type='dot',
+                coords=c,
+                offset=(0, 0),
+                bbox=tuple(bbox),
+                priority=priority,
+                group=group,
+            )
+            for id, c, bbox, priority, group in zip(ids, coords, bboxes.tolist(), priorities, groups)
+        ]
+        self._register_many(elements, bboxes)
+        return elements
+
     def add_fixed_rect(
         self,
         id: str,
@@ -382,7 +774,7 @@ class PlacementManager:
             bbox=bbox,
             priority=priority,
         )
-        self.elements[id] = element
+        self._register(id, element)
         logger.debug(f"Added fixed rect '{id}' type={element_type} bbox={bbox}")
         return element
 
@@ -415,14 +807,9 @@ class PlacementManager:
         if priority is None:
             priority = PRIORITY['campaign_label']
 
-        # Text dimensions in points
-        char_width = fontsize * 0.6
-        text_width_pts = len(text) * char_width
-        text_height_pts = fontsize * 1.2
-
-        # Convert to degrees
-        text_width_deg = text_width_pts * self.dpp
-        text_height_deg = text_height_pts * self.dpp
+        # Text dimensions in degrees
+        char_width_deg, text_height_deg = self._text_metrics(fontsize)
+        text_width_deg = len(text) * char_width_deg
         gap_deg = gap_pts * self.dpp
 
         # Offset along normal
@@ -434,8 +821,7 @@ class PlacementManager:
         center_y = coords[1] + y_offset_deg
 
         # AABB for rotated rectangle
-        rad = math.radians(rotation)
-        cos_r, sin_r = abs(math.cos(rad)), abs(math.sin(rad))
+        cos_r, sin_r = (abs(v) for v in _rotation_trig(rotation))
         aabb_width = text_width_deg * cos_r + text_height_deg * sin_r
         aabb_height = text_width_deg * sin_r + text_height_deg * cos_r
 
@@ -455,9 +841,11 @@ class PlacementManager:
             priority=priority,
             text=text,
             group=group,
+            sub_bboxes=_letter_bboxes((center_x, center_y), rotation, text,
+                                      char_width_deg, text_height_deg),
         )
 
-        self.elements[id] = element
+        self._register(id, element)
         logger.debug(f"Added campaign label '{id}': {text}")
         return element
 
@@ -498,22 +886,16 @@ class PlacementManager:
         else:
             x_offset_deg, y_offset_deg = 0, 0
 
-        # Text dimensions in points
-        char_width = fontsize * 0.6
-        text_width_pts = len(text) * char_width
-        text_height_pts = fontsize * 1.2
-
-        # Convert to degrees
-        text_width_deg = text_width_pts * self.dpp
-        text_height_deg = text_height_pts * self.dpp
+        # Text dimensions in degrees
+        char_width_deg, text_height_deg = self._text_metrics(fontsize)
+        text_width_deg = len(text) * char_width_deg
 
         # Center of rotated text is at coords + offset
         center_x = coords[0] + x_offset_deg
         center_y = coords[1] + y_offset_deg
 
         # AABB for rotated rectangle
-        rad = math.radians(rotation)
-        cos_r, sin_r = abs(math.cos(rad)), abs(math.sin(rad))
+        cos_r, sin_r = (abs(v) for v in _rotation_trig(rotation))
         aabb_width = text_width_deg * cos_r + text_height_deg * sin_r
         aabb_height = text_width_deg * sin_r + text_height_deg * cos_r
 
@@ -533,12 +915,13 @@ class PlacementManager:
             priority=priority,
             text=text,
             group=group,
+            rotation=rotation,
+            normal=normal,
+            sub_bboxes=_letter_bboxes((center_x, center_y), rotation, text,
+                                      char_width_deg, text_height_deg),
         )
-        # Store rotation and normal for rendering
-        element.rotation = rotation
-        element.normal = normal
 
-        self.elements[id] = element
+        self._register(id, element)
         logger.debug(f"Added river label '{id}': {text} at {coords}, gap={gap_pts}pts")
         return element
 
@@ -577,47 +960,9 @@ class PlacementManager:
             return []
 
         # Minimal padding for line width
-        padding = linewidth_pts * self.dpp
-
-        elements = []
-        num_points = len(path)
-
-        # Break path into segments
-        for seg_start in range(0, num_points - 1, segment_length):
-            seg_end = min(seg_start + segment_length + 1, num_points)
-            segment = path[seg_start:seg_end]
-
-            if len(segment) < 2:
-                continue
-
-            # Compute bounding box for this segment
-            lons = [p[0] for p in segment]
-            lats = [p[1] for p in segment]
-
-            bbox = (
-                min(lons) - padding,
-                min(lats) - padding,
-                max(lons) + padding,
-                max(lats) + padding,
-            )
-
-            # Use segment midpoint as coords
-            mid_idx = len(segment) // 2
-            coords = tuple(segment[mid_idx])
-
-            seg_id = f"{id}_seg{seg_start}"
-            element = PlacementElement(
-                id=seg_id,
-                type='campaign_arrow',
-                coords=coords,
-                offset=(0, 0),
-                bbox=bbox,
-                priority=priority,
-                group=group,
-            )
-
-            self.elements[seg_id] = element
-            elements.append(element)
+        segments = _segment_path(path, linewidth_pts * self.dpp, segment_length)
+        elements = self._build_arrow_segments(id, segments, priority, group)
+        self._register_many(elements, segments[1])
 
         logger.debug(f"Added campaign arrow '{id}' as {len(elements)} segments")
         return elements
@@ -633,24 +978,87 @@ class PlacementManager:
         Returns:
             List of existing elements that would overlap
         """
-        overlapping = []
-        for existing in self.elements.values():
-            # Skip same group
-            if element.group and existing.group and element.group == existing.group:
-                continue
-            # Region labels are semi-transparent decorative text:
-            # - Non-region elements don't need to avoid regions
-            # - Region elements only avoid capital city dots/labels and map boxes
-            # map_box (title cartouche, narrative box) only blocks regions, not other labels
-            if existing.type == 'region':
-                continue  # regions never block other elements
-            if element.type != 'region' and existing.type == 'map_box':
-                continue  # map_box only matters for region placement
-            if element.type == 'region' and existing.type not in ('city_level_1', 'city_label_1', 'map_box'):
-                continue  # regions avoid capitals and map boxes
-            if self._bbox_intersects(element.bbox, existing.bbox):
-                overlapping.append(existing)
-        return overlapping
+        # Only the bbox hits go through the per-type and per-letter checks
+        row_elems = self._row_elems
+        bbox_arr = self._bbox_arr
+        return [row_elems[row] for row in self._query_rows(element.bbox, element.group)
+                if _blocks(element, row_elems[row])
+                and _letters_intersect(element, row_elems[row], b_box=bbox_arr[row:row + 1])]
+
+    def any_overlap(self, element: PlacementElement) -> Optional[PlacementElement]:
+        """
+        Like would_overlap(), but stop at the first overlapping element.
+
+        For accept/reject decisions that don't need the full list.
+
+        Returns:
+            The first existing element that would overlap, or None
+        """
+        for row in self._query_rows(element.bbox, element.group):
+            existing = self._row_elems[row]
+            if _blocks(element, existing) and _letters_intersect(
+                    element, existing, b_box=self._bbox_arr[row:row + 1]):
+                return existing
+        return None
+
+    def _query_rows(self, bbox: tuple, group: Optional[str] = None) -> list[int]:
+        """
+        Buffer rows of live elements whose bboxes intersect bbox, in row order.
+
+        Small buffers are tested in one vectorized pass; dead rows are NaN and
+        never match. Larger ones only test the rows filed under the grid cells
+        the query touches. Rows in the given group are left out, by comparing
+        integer group codes.
+        """
+        n = len(self._row_ids)
+        # Round the query to the buffer's dtype so both sides compare alike
+        query = np.asarray(bbox, dtype=self._bbox_arr.dtype)
+
+        if n < INDEX_MIN_ROWS:
+            rows = _overlap_rows(query, self._bbox_arr[:n])
+        else:
+            if self._grid is None:
+                self._build_grid()
+            grid = self._grid
+            near = list(self._grid_big)
+            cols, grid_rows = self._grid_span(query)
+            for col in cols:
+                for grid_row in grid_rows:
+                    near.extend(grid.get((col, grid_row), ()))
+            rows = np.unique(np.array(near, dtype=np.intp))
+            rows = rows[_overlap_rows(query, self._bbox_arr[rows])]
+
+        # A group never seen by the manager cannot match any row
+        code = self._group_codes.get(group, -1) if group else -1
+        if code >= 0:
+            rows = rows[self._group_arr[rows] != code]
+        return rows.tolist()
+
+    def _grid_span(self, bbox) -> tuple:
+        """Column and row ranges of the grid cells a bbox touches."""
+        cell = self._grid_cell
+        x1, y1, x2, y2 = (float(v) for v in bbox)
+        return (range(math.floor(x1 / cell), math.floor(x2 / cell) + 1),
+                range(math.floor(y1 / cell), math.floor(y2 / cell) + 1))
+
+    def _grid_insert(self, row: int):
+        """File a buffer row under every grid cell its bbox touches."""
+        cols, grid_rows = self._grid_span(self._bbox_arr[row])
+        if len(cols) * len(grid_rows) > GRID_MAX_CELLS:
+            self._grid_big.append(row)
+            return
+        grid = self._grid
+        for col in cols:
+            for grid_row in grid_rows:
+                grid.setdefault((col, grid_row), []).append(row)
+
+    def _build_grid(self):
+        """(Re)build the grid index from the live rows of the buffer."""
+        self._grid = {}
+        self._grid_big = []
+        for row, rid in enumerate(self._row_ids):
+            if rid is not None:
+                self._grid_insert(row)
 
     def remove(self, id: str) -> bool:
         """
@@ -661,42 +1069,147 @@ class PlacementManager:
         """
         if id in self.elements:
             del self.elements[id]
+            self._kill_row(self._rows.pop(id))
             return True
         return False
 
+    def _register(self, id: str, element: PlacementElement):
+        """Store an element under id and mirror its bbox into the SoA buffer."""
+        if id in self._rows:
+            self._kill_row(self._rows[id])
+        row = len(self._row_ids)
+        if row == len(self._bbox_arr):
+            self._grow()
+            row = len(self._row_ids)
+        self._bbox_arr[row] = element.bbox
+        self._group_arr[row] = self._group_code(element.group)
+        self._row_ids.append(id)
+        self._row_elems.append(element)
+        self._rows[id] = row
+        self.elements[id] = element
+        if self._grid is not None:
+            self._grid_insert(row)
+
+    def _register_many(self, elements: list, bboxes: np.ndarray):
+        """Register elements under their ids, copying bboxes into the buffer as one block."""
+        ids = [e.id for e in elements]
+        if len(set(ids)) < len(ids) or not self._rows.keys().isdisjoint(ids):
+            # Re-registrations replace earlier rows: take the one-by-one path
+            for element in elements:
+                self._register(element.id, element)
+            return
+        while len(self._row_ids) + len(ids) > len(self._bbox_arr):
+            self._grow()
+        start = len(self._row_ids)
+        self._bbox_arr[start:start + len(ids)] = bboxes
+        self._group_arr[start:start + len(ids)] = [self._group_code(e.group) for e in elements]
+        self._row_ids.extend(ids)
+        self._row_elems.extend(elements)
+        self._rows.update(zip(ids, range(start, start + len(ids))))
+        self.elements.update(zip(ids, elements))
+        if self._grid is not None:
+            for row in range(start, start + len(ids)):
+                self._grid_insert(row)
+
+    def _group_code(self, group: Optional[str]) -> int:
+        """Interned integer code for a group name; -1 for no group."""
+        if not group:
+            return -1
+        return self._group_codes.setdefault(group, len(self._group_codes))
+
+    def _kill_row(self, row: int):
+        """Mark a buffer row dead; NaN bboxes fail every intersection test."""
+        self._row_ids[row] = None
+        self._row_elems[row] = None
+        self._bbox_arr[row] = np.nan
+
+    def _grow(self):
+        """Make room in the bbox buffer: drop dead rows, or double it if mostly live."""
+        live = [i for i, rid in enumerate(self._row_ids) if rid is not None]
+        # Compacting only helps when there are dead rows to drop; an empty or
+        # all-live buffer must double, or _register_many() would loop forever
+        if len(live) < len(self._row_ids) and len(live) * 2 <= len(self._row_ids):
+            self._bbox_arr[:len(live)] = self._bbox_arr[live]
+            self._group_arr[:len(live)] = self._group_arr[live]
+            self._row_ids = [self._row_ids[i] for i in live]
+            self._row_elems = [self._row_elems[i] for i in live]
+            self._rows = {rid: i for i, rid in enumerate(self._row_ids)}
+            # Rows moved: the grid index and overlap cache no longer match the buffer
+            self._grid = None
+            self._overlap_cache = None
+        else:
+            grown = np.empty((len(self._bbox_arr) * 2, 4), dtype=self._bbox_arr.dtype)
+            grown[:len(self._row_ids)] = self._bbox_arr[:len(self._row_ids)]
+            self._bbox_arr = grown
+            self._group_arr = np.resize(self._group_arr, len(grown))
+
     def _bbox_intersects(self, b1: tuple, b2: tuple) -> bool:
         """
         Check if two bounding boxes intersect.
 
+        Touching edges count as intersecting. The four comparisons are
+        combined with & rather than and, so there is no branch per test.
+
         Args:
             b1, b2: (x1, y1, x2, y2) bounding boxes
         """
-        return not (
-            b1[2] < b2[0] or  # b1 right edge left of b2 left edge
-            b1[0] > b2[2] or  # b1 left edge right of b2 right edge
-            b1[3] < b2[1] or  # b1 top edge below b2 bottom edge
-            b1[1] > b2[3]     # b1 bottom edge above b2 top edge
-        )
+        ax1, ay1, ax2, ay2 = b1
+        bx1, by1, bx2, by2 = b2
+        return bool((ax2 >= bx1) & (ax1 <= bx2) & (ay2 >= by1) & (ay1 <= by2))
 
     def detect_overlaps(self) -> list[tuple[PlacementElement, PlacementElement]]:
         """
         Detect all overlapping element pairs.
 
+        The bbox-level pairs are remembered between calls: if few rows were
+        added since the last call, only those are tested, and pairs whose
+        elements were removed since are dropped.
+
         Returns:
             List of (element1, element2) tuples for overlapping pairs
         """
-        overlaps = []
-        elements = list(self.elements.values())
-
-        for i, e1 in enumerate(elements):
-            for e2 in elements[i + 1:]:
-                # Skip same group (e.g., above/below labels on same campaign)
-                if e1.group and e2.group and e1.group == e2.group:
-                    continue
-                if self._bbox_intersects(e1.bbox, e2.bbox):
-                    overlaps.append((e1, e2))
-
-        return overlaps
+        n = len(self._row_ids)
+        bboxes = self._bbox_arr[:n]
+        cache = self._overlap_cache
+
+        if cache is not None and n - cache[0] <= DENSE_OVERLAP_MAX:
+            checked, left, right = cache
+            # Dead rows are NaN: drop cached pairs that lost an element
+            alive = ~np.isnan(bboxes[left, 0]) & ~np.isnan(bboxes[right, 0])
+            new_right, new_left = np.nonzero(_overlap_mask(bboxes[checked:], bboxes))
+            new_right += checked
+            left = np.concatenate((left[alive], new_left))
+            right = np.concatenate((right[alive], new_right))
+        else:
+            # Dead rows are NaN, so live rows can be found without a Python scan
+            live = np.flatnonzero(~np.isnan(bboxes[:, 0]))
+            live_bboxes = bboxes[live]
+            if len(live) <= DENSE_OVERLAP_MAX:
+                # Small maps: one broadcast over all pairs beats building a tree
+                left, right = np.nonzero(_overlap_mask(live_bboxes, live_bboxes))
+            elif len(live) <= SWEEP_OVERLAP_MAX:
+                left, right = _sweep_pairs(live_bboxes)
+            else:
+                # Bulk-load an STR-packed R-tree and query it with every bbox at once.
+                # Without a predicate the query tests envelopes, which for boxes is
+                # exactly the (edge-inclusive) bbox intersection.
+                boxes = shapely.box(*live_bboxes.T)
+                left, right = shapely.STRtree(boxes).query(boxes)
+            left, right = live[left], live[right]
+
+        # Same-group pairs (e.g., above/below labels on same campaign) drop
+        # out in bulk via the group code column (-1 = ungrouped)
+        codes = self._group_arr
+        keep = (left < right) & ((codes[left] != codes[right]) | (codes[left] < 0))
+        order = np.lexsort((right[keep], left[keep]))
+        left, right = left[keep][order], right[keep][order]
+        self._overlap_cache = (n, left, right)
+
+        row_elems = self._row_elems
+        bbox_arr = self._bbox_arr
+        return [(row_elems[i], row_elems[j]) for i, j in zip(left.tolist(), right.tolist())
+                if _letters_intersect(row_elems[i], row_elems[j],
+                                      a_box=bbox_arr[i:i + 1], b_box=bbox_arr[j:j + 1])]
 
     def log_overlaps(self):
         """Detect overlaps and log warnings."""
@@ -712,7 +1225,7 @@ class PlacementManager:
             e2_desc = f"{e2.type} '{e2.text or e2.id}'"
             logger.warning(f"  - {e1_desc} overlaps with {e2_desc}")
 
-    def resolve_greedy(self, candidates: list) -> dict:
+    def resolve_greedy(self, candidates: Iterable) -> dict:
         """
         Resolve label positions using priority-ordered greedy algorithm.
 
@@ -720,18 +1233,22 @@ class PlacementManager:
         order and picks the first that doesn't overlap with already-placed elements.
 
         Args:
-            candidates: List of LabelCandidate with multiple positions each
+            candidates: Iterable of LabelCandidate with multiple positions each
+                (consumed once, so a chain of several lists works)
 
         Returns:
             Dict mapping element ID to resolved PlacementElement
         """
-        # Sort by priority (highest first)
-        sorted_candidates = sorted(candidates, key=lambda c: -c.priority)
+        # Sort by priority (highest first); reverse=True keeps ties in input order
+        sorted_candidates = sorted(candidates, key=attrgetter('priority'), reverse=True)
 
         resolved = {}
         unresolved = []
 
-        logger.debug(f"Resolving {len(candidates)} candidates, checking against {len(self.elements)} fixed elements")
+        logger.debug(f"Resolving {len(sorted_candidates)} candidates, checking against {len(self.elements)} fixed elements")
+
+        # Rejection details are only ever logged at DEBUG: skip building them otherwise
+        debug = logger.isEnabledFor(logging.DEBUG)
 
         for candidate in sorted_candidates:
             placed = False
@@ -742,9 +1259,9 @@ class PlacementManager:
                 logger.debug(f"Resolving paired '{candidate.id}' (priority={candidate.priority}, "
                              f"{len(candidate.positions)} position pairs)")
                 for idx, elems in enumerate(candidate.positions):
-                    if all(not self.would_overlap(e) for e in elems):
+                    if all(self.any_overlap(e) is None for e in elems):
                         for e in elems:
-                            self.elements[e.id] = e
+                            self._register(e.id, e)
                             resolved[e.id] = e
                         candidate.resolved_idx = idx
                         placed = True
@@ -755,7 +1272,7 @@ class PlacementManager:
                     fb = candidate.fallback_idx
                     elems = candidate.positions[fb]
                     for e in elems:
-                        self.elements[e.id] = e
+                        self._register(e.id, e)
                         resolved[e.id] = e
                     candidate.resolved_idx = fb
                     unresolved.append(candidate)
@@ -767,17 +1284,18 @@ class PlacementManager:
                         f"{len(candidate.positions)} positions)")
 
             for idx, position in enumerate(candidate.positions):
-                # Check against already-resolved elements
-                overlaps = self.would_overlap(position)
+                # Check against already-resolved elements; the full list of
+                # blockers is only needed for debug logging
+                overlaps = self.would_overlap(position) if debug else self.any_overlap(position)
                 if not overlaps:
                     # Success - use this position
-                    self.elements[position.id] = position
+                    self._register(position.id, position)
                     candidate.resolved_idx = idx
                     resolved[candidate.id] = position
                     placed = True
                     logger.info(f"  -> Placed at position {idx} (no overlaps)")
                     break
-                else:
+                elif debug:
                     # Track what caused the rejection
                     overlap_details = [(o.id, o.type, o.text) for o in overlaps]
                     rejection_reasons.append((idx, position.bbox, overlap_details))
@@ -789,7 +1307,7 @@ class PlacementManager:
                 # All positions overlap - use fallback (1.3x tier) and log warning
                 fb = candidate.fallback_idx
                 position = candidate.positions[fb]
-                self.elements[position.id] = position
+                self._register(position.id, position)
                 candidate.resolved_idx = fb
                 resolved[candidate.id] = position
                 unresolved.append(candidate)
@@ -819,121 +1337,126 @@ class PlacementManager:
             Dict mapping arrow ID to resolved ArrowCandidate
         """
         resolved = {}
+        linewidth_pts = 2.5
+        padding = linewidth_pts * self.dpp
+        arrow_priority = PRIORITY.get('campaign_arrow', 55)
 
         for candidate in arrow_candidates:
-            placed = False
-
-            for idx, variant in enumerate(candidate.variants):
-                # Create temporary segment elements for overlap check
-                temp_elements = self._create_arrow_segments_temp(
-                    f"temp_{candidate.id}",
-                    variant['path'],
-                    linewidth_pts=2.5
-                )
-
-                # Check if any segment overlaps with existing elements
-                has_overlap = False
-                for elem in temp_elements:
-                    if self.would_overlap(elem):
-                        has_overlap = True
-                        break
-
-                if not has_overlap:
-                    # Success - use this gap distance
-                    candidate.resolved_idx = idx
-                    # Add actual segments to PM
-                    self.add_campaign_arrow(
-                        candidate.id,
-                        path=variant['path'],
-                        linewidth_pts=2.5,
-                        priority=candidate.priority,
-                        group=candidate.group,
-                    )
-                    resolved[candidate.id] = candidate
-                    placed = True
-                    logger.debug(f"Arrow {candidate.id} placed at {variant['gap_multiplier']}x gap")
-                    break
-
-            if not placed:
+            # Segment bboxes per variant, shared by the overlap probe and the
+            # final commit (which may be the fallback variant)
+            variant_segments = [
+                None if variant['path'] is None or len(variant['path']) < 2
+                else _segment_path(variant['path'], padding, 10)
+                for variant in candidate.variants
+            ]
+            idx = self._first_clear_variant(candidate, variant_segments, arrow_priority)
+
+            if idx is not None:
+                # Success - use this gap distance
+                variant = candidate.variants[idx]
+                candidate.resolved_idx = idx
+                # Add actual segments to PM
+                self._add_arrow_segments(candidate, variant_segments[idx])
+                resolved[candidate.id] = candidate
+                logger.debug(f"Arrow {candidate.id} placed at {variant['gap_multiplier']}x gap")
+            else:
                 # All gaps conflict - use smallest (1x, closest to anchor) and log warning
                 candidate.resolved_idx = 0
                 variant = candidate.variants[0]
-                self.add_campaign_arrow(
-                    candidate.id,
-                    path=variant['path'],
-                    linewidth_pts=2.5,
-                    priority=candidate.priority,
-                    group=candidate.group,
-                )
+                self._add_arrow_segments(candidate, variant_segments[0])
                 resolved[candidate.id] = candidate
                 logger.warning(f"Arrow {candidate.id} conflicts at all gaps - using {variant['gap_multiplier']}x (closest to anchor)")
 
         return resolved
 
-    def _create_arrow_segments_temp(
-        self,
-        id: str,
-        path: list,
-        linewidth_pts: float = 2.5,
-        segment_length: int = 10,
-    ) -> list:
+    def _first_clear_variant(self, candidate: ArrowCandidate, variant_segments: list,
+                             priority: int) -> Optional[int]:
         """
-        Create temporary PlacementElements for arrow segments without adding to manager.
-
-        Used for checking overlaps before committing to a particular arrow variant.
-
-        Args:
-            id: Base identifier
-            path: List of (lon, lat) coordinates
-            linewidth_pts: Line width in points
-            segment_length: Number of points per segment
+        Index of the first arrow variant with no overlapping segment, or None.
 
-        Returns:
-            List of PlacementElements (not added to self.elements)
+        The segments of all variants are tested against the bbox buffer in one
+        pass (per segment through the spatial index on large maps); only the
+        bbox hits then go through the blocking rules, variant by variant. A
+        variant without segments (invalid path) is always clear.
         """
-        if path is None or len(path) < 2:
-            return []
-
-        # Minimal padding for line width
-        padding = linewidth_pts * self.dpp
-
-        elements = []
-        num_points = len(path)
-
-        # Break path into segments
-        for seg_start in range(0, num_points - 1, segment_length):
-            seg_end = min(seg_start + segment_length + 1, num_points)
-            segment = path[seg_start:seg_end]
-
-            if len(segment) < 2:
-                continue
+        boxes = [segments[1] for segments in variant_segments if segments is not None]
+        if not boxes:
+            return 0 if variant_segments else None
+        boxes = np.concatenate(boxes)
+        owner = np.repeat(
+            [idx for idx, segments in enumerate(variant_segments) if segments is not None],
+            [len(segments[1]) for segments in variant_segments if segments is not None],
+        )
 
-            # Compute bounding box for this segment
-            lons = [p[0] for p in segment]
-            lats = [p[1] for p in segment]
+        n = len(self._row_ids)
+        if n < INDEX_MIN_ROWS:
+            queries = boxes.astype(self._bbox_arr.dtype)
+            hit_segs, hit_rows = np.nonzero(_overlap_mask(queries, self._bbox_arr[:n]))
+        else:
+            per_seg = [self._query_rows(bbox) for bbox in boxes.tolist()]
+            hit_segs = np.repeat(np.arange(len(boxes)), [len(rows) for rows in per_seg])
+            hit_rows = np.fromiter((row for rows in per_seg for row in rows), dtype=np.intp,
+                                   count=len(hit_segs))
+        hit_owner = owner[hit_segs]
+
+        # One ungrouped probe for the blocking rules; its bbox is read straight
+        # from the stacked segment array
+        probe = PlacementElement(
+            id=f"temp_{candidate.id}",
+            type='campaign_arrow',
+            coords=(0, 0),
+            offset=(0, 0),
+            bbox=None,
+            priority=priority,
+        )
+        for idx, segments in enumerate(variant_segments):
+            if segments is None:
+                return idx
+            mine = hit_owner == idx
+            for seg, row in zip(hit_segs[mine].tolist(), hit_rows[mine].tolist()):
+                existing = self._row_elems[row]
+                if _blocks(probe, existing) and _letters_intersect(
+                        probe, existing, a_box=boxes[seg:seg + 1], b_box=self._bbox_arr[row:row + 1]):
+                    break
+            else:
+                return idx
+        return None
+
+    def _add_arrow_segments(self, candidate: ArrowCandidate, segments: tuple):
+        """Register precomputed segments of a resolved arrow, as add_campaign_arrow() would."""
+        if segments is None:
+            logger.warning(f"Campaign arrow '{candidate.id}' has invalid path")
+            return
+        priority = candidate.priority
+        if priority is None:
+            priority = PRIORITY.get('campaign_arrow', 55)
+        elements = self._build_arrow_segments(candidate.id, segments, priority, candidate.group)
+        self._register_many(elements, segments[1])
+        logger.debug(f"Added campaign arrow '{candidate.id}' as {len(elements)} segments")
 
-            bbox = (
-                min(lons) - padding,
-                min(lats) - padding,
-                max(lons) + padding,
-                max(lats) + padding,
-            )
+    def _build_arrow_segments(self, id: str, segments: tuple, priority: int, group: Optional[str]) -> list:
+        """
+        Build (unregistered) arrow segment elements from _segment_path() output.
 
-            # Use segment midpoint as coords
-            mid_idx = len(segment) // 2
-            coords = tuple(segment[mid_idx])
+        Args:
+            id: Base identifier (segments will be id_seg0, id_seg10, etc.)
+            segments: (starts, bboxes, mids) as returned by _segment_path()
+            priority: Higher = more important
+            group: Elements in same group don't count as overlapping
 
-            seg_id = f"{id}_seg{seg_start}"
-            element = PlacementElement(
-                id=seg_id,
+        Returns:
+            List of PlacementElements, one per segment
+        """
+        starts, bboxes, mids = segments
+        return [
+            PlacementElement(
+                id=f"{id}_seg{seg_start}",
                 type='campaign_arrow',
-                coords=coords,
+                coords=tuple(coords),
                 offset=(0, 0),
-                bbox=bbox,
-                priority=PRIORITY.get('campaign_arrow', 55),
-                group=None,  # No group for temp elements
+                bbox=tuple(bbox),
+                priority=priority,
+                group=group,
             )
-
-            elements.append(element)
-
-        return elements
+            for seg_start, bbox, coords in zip(starts.tolist(), bboxes.tolist(), mids.tolist())
+        ]
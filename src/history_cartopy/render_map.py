@@ -1,33 +1,23 @@
 #!/usr/bin/python3
 
 import argparse
+import bisect
+import functools
+import gc
+import http.client
 import logging
+import math
 import os
+import sys
+import threading
+import time
+import urllib.error
 import urllib.request
 import zipfile
 import shutil
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import date
-import matplotlib.pyplot as plt
-import cartopy.crs as ccrs
-from cartopy.mpl.gridliner import LONGITUDE_FORMATTER, LATITUDE_FORMATTER
-from PIL import Image
-from history_cartopy.core import load_data
-from history_cartopy.labels import collect_labels, render_labels_resolved
-from history_cartopy.events import collect_events, render_events_resolved
-from history_cartopy.campaigns import (
-    collect_arrow_candidates, collect_campaign_labels, render_campaigns_resolved
-)
-from history_cartopy.territories import render_territories
-from history_cartopy.border_styles import render_border
-from history_cartopy.title_cartouche import render_title_cartouche, estimate_title_box_fracs
-from history_cartopy.narrative import (
-    collect_narrative_markers, render_narrative_markers, render_narrative_box,
-    estimate_narrative_box_fracs,
-)
-from history_cartopy.placement import PlacementManager
-from history_cartopy.pairing import detect_and_pair
-from history_cartopy.styles import get_deg_per_pt
-from history_cartopy.themes import apply_theme, CITY_LEVELS, EVENT_CONFIG
+from itertools import chain
 
 # Configure logging
 logging.basicConfig(
@@ -37,7 +27,8 @@ logging.basicConfig(
 logger = logging.getLogger('history_cartopy')
 
 
-# Natural Earth background image download URLs
+# Natural Earth background image download URLs. An entry's 'format' is 'zip'
+# (the default: an archive holding the tif) or 'tif' (the tif served bare).
 BACKGROUND_DOWNLOADS = {
     'HYP_HR_SR_OB_DR.tif': {
         'url': 'https://naciscdn.org/naturalearth/10m/raster/HYP_HR_SR_OB_DR.zip',
@@ -65,6 +56,43 @@ BACKGROUND_DOWNLOADS = {
     },
 }
 
+# Buffer size for streaming downloads and archive members to disk
+COPY_BUFFER_SIZE = 1 << 20
+
+# Minimum seconds between download progress redraws
+PROGRESS_INTERVAL = 0.25
+
+# Background files fetched concurrently by --init
+DOWNLOAD_WORKERS = 4
+
+# Seconds to wait before each retry of a download that failed transiently
+DOWNLOAD_RETRY_DELAYS = (2, 4, 8, 16)
+
+# Set on Ctrl-C so download workers stop at their next chunk
+_DOWNLOAD_CANCEL = threading.Event()
+
+# Degrees of background kept around the map extent when cropping the raster,
+# so interpolation at the map edge still has the neighbouring pixels
+BACKGROUND_CROP_MARGIN_DEG = 1
+
+# zlib level for the PNG output. Encoding a full-size map is dominated by zlib;
+# level 3 encodes about a third faster than PIL's default of 6, with levels
+# below 3 no faster and only larger.
+PNG_COMPRESS_LEVEL = 3
+
+# Quality for JPEG output (--output-format jpeg or a .jpg/.jpeg filename)
+JPEG_QUALITY = 92
+
+# Output formats encoded from the Agg buffer, by file extension
+RASTER_FORMATS = {'.png': 'png', '.jpg': 'jpeg', '.jpeg': 'jpeg'}
+
+# Map sizes in pixels suggested by _validate_dimensions(): 3:2, and divisible
+# by both 300 dpi and the 200px border tile
+RECOMMENDED_DIMENSIONS = frozenset({(3600, 2400), (4800, 3200), (6000, 4000)})
+
+# Round scale bar lengths in km, ascending
+NICE_SCALE_KM = (1, 2, 5, 10, 20, 25, 50, 100, 200, 250, 500, 1000)
+
 # Natural Earth vector data downloads
 VECTOR_DOWNLOADS = {
     'ne_10m_rivers_lake_centerlines': {
@@ -75,102 +103,287 @@ VECTOR_DOWNLOADS = {
 }
 
 
+@functools.cache
 def _get_data_dir():
-    """Get the data directory path, using package-relative path."""
+    """
+    Get the data directory path.
+
+    HISTORY_CARTOPY_DATA overrides the package-relative default, the data/
+    directory of a source checkout, which an installed (non-editable)
+    package does not have. Resolved once per process.
+    """
+    env_dir = os.environ.get('HISTORY_CARTOPY_DATA')
+    if env_dir:
+        return os.path.abspath(env_dir)
     script_dir = os.path.dirname(os.path.abspath(__file__))
     data_dir = os.path.join(script_dir, '..', '..', 'data')
     return os.path.normpath(data_dir)
 
 
-def download_backgrounds():
-    """Download Natural Earth background images to the data/backgrounds directory."""
-    # Determine backgrounds directory
-    backgrounds_dir = os.path.join(_get_data_dir(), 'backgrounds')
+class TruncatedDownloadError(IOError):
+    """A download ended before the size announced by Content-Length."""
 
-    os.makedirs(backgrounds_dir, exist_ok=True)
 
-    print(f"Downloading Natural Earth backgrounds to: {backgrounds_dir}")
-    print()
+class DownloadCancelled(Exception):
+    """A download was stopped because _DOWNLOAD_CANCEL was set."""
 
-    for tif_name, info in BACKGROUND_DOWNLOADS.items():
-        tif_path = os.path.join(backgrounds_dir, tif_name)
 
-        if os.path.exists(tif_path):
-            print(f"[SKIP] {tif_name} already exists")
-            continue
+def _download_file(url, dest_path, show_progress=True, resume=False):
+    """
+    Stream a URL to dest_path in COPY_BUFFER_SIZE chunks.
 
-        print(f"[DOWNLOAD] {info['description']}")
-        print(f"  URL: {info['url']}")
+    Progress is redrawn at most once every PROGRESS_INTERVAL seconds rather
+    than once per block.
 
-        zip_name = os.path.basename(info['url'])
-        zip_path = os.path.join(backgrounds_dir, zip_name)
+    Args:
+        url: Source URL
+        dest_path: File to write
+        show_progress: Print an in-place progress line
+        resume: If dest_path already holds a partial download, request only
+            the rest with an HTTP Range header and append to it. Servers that
+            ignore the range get a fresh download.
 
-        try:
-            # Download with progress
-            def report_progress(block_num, block_size, total_size):
-                downloaded = block_num * block_size
-                if total_size > 0:
-                    percent = min(100, downloaded * 100 // total_size)
+    Raises:
+        TruncatedDownloadError: If fewer bytes arrive than Content-Length announced
+        DownloadCancelled: If _DOWNLOAD_CANCEL is set mid-download; the partial
+            file is kept
+    """
+    offset = os.path.getsize(dest_path) if resume and os.path.exists(dest_path) else 0
+    request = urllib.request.Request(url, headers={'Range': f"bytes={offset}-"} if offset else {})
+    try:
+        response = urllib.request.urlopen(request)
+    except urllib.error.HTTPError as e:
+        if e.code != 416:
+            raise
+        # Range Not Satisfiable: the partial file is no prefix of this
+        # resource, so start over
+        offset = 0
+        response = urllib.request.urlopen(url)
+
+    with response:
+        if offset and response.status != 206:
+            offset = 0
+
+        content_length = int(response.headers.get('Content-Length') or 0)
+        total = offset + content_length if content_length else 0
+        downloaded = offset
+        last_report = 0.0
+        with open(dest_path, 'ab' if offset else 'wb') as out:
+            while True:
+                if _DOWNLOAD_CANCEL.is_set():
+                    raise DownloadCancelled("download cancelled")
+                chunk = response.read(COPY_BUFFER_SIZE)
+                if not chunk:
+                    break
+                out.write(chunk)
+                downloaded += len(chunk)
+                now = time.monotonic()
+                if show_progress and total > 0 and (now - last_report >= PROGRESS_INTERVAL or downloaded >= total):
+                    last_report = now
+                    percent = min(100, downloaded * 100 // total)
                     mb_downloaded = downloaded / (1024 * 1024)
-                    mb_total = total_size / (1024 * 1024)
+                    mb_total = total / (1024 * 1024)
                     print(f"\r  Progress: {percent}% ({mb_downloaded:.1f}/{mb_total:.1f} MB)", end='', flush=True)
+    if show_progress and total > 0:
+        print()  # newline after progress
+
+    if total and downloaded != total:
+        raise TruncatedDownloadError(f"truncated download: got {downloaded} of {total} bytes")
+
+
+def _is_transient(error):
+    """
+    Whether a download error is worth retrying: network trouble, a 5xx, or a
+    truncated body. Local file errors (permissions, a full disk) are not.
+    """
+    if isinstance(error, urllib.error.HTTPError):
+        return error.code >= 500
+    return isinstance(error, (urllib.error.URLError, ConnectionError, TimeoutError,
+                              http.client.IncompleteRead, TruncatedDownloadError))
 
-            urllib.request.urlretrieve(info['url'], zip_path, reporthook=report_progress)
-            print()  # newline after progress
 
-            # Extract the tif file
-            print(f"  Extracting {tif_name}...")
+def _download_with_retries(url, dest_path, label, **kwargs):
+    """
+    _download_file() with a retry after each delay in DOWNLOAD_RETRY_DELAYS.
+
+    Only transient errors are retried; with resume=True each retry picks up
+    where the failed attempt stopped.
+    """
+    for delay in DOWNLOAD_RETRY_DELAYS + (None,):
+        try:
+            return _download_file(url, dest_path, **kwargs)
+        except Exception as e:
+            if delay is None or not _is_transient(e):
+                raise
+            _log_line(f"[RETRY] {label} in {delay}s: {e}")
+            if _DOWNLOAD_CANCEL.wait(delay):
+                raise DownloadCancelled("download cancelled") from e
+
+
+def _log_line(message):
+    """Print message with its newline in a single write, safe across threads."""
+    sys.stdout.write(message + '\n')
+    sys.stdout.flush()
+
+
+def _download_one(tif_name, info, backgrounds_dir):
+    """
+    Download one background tif to backgrounds_dir, extracting it from its
+    zip unless the entry's format is 'tif'.
+
+    Runs on a worker thread, so it reports through _log_line() with whole
+    lines tagged with tif_name rather than an in-place progress bar.
+    """
+    tif_path = os.path.join(backgrounds_dir, tif_name)
+
+    if os.path.exists(tif_path):
+        _log_line(f"[SKIP] {tif_name} already exists")
+        return
+
+    _log_line(f"[DOWNLOAD] {tif_name}: {info['description']}\n  URL: {info['url']}")
+
+    # A bare tif downloads straight to a .part beside its final name. A zip
+    # is named after the tif so concurrent workers never share a zip path.
+    # Either way the download goes to a .part name that survives failed runs,
+    # so the next --init resumes it instead of starting over.
+    direct = info.get('format', 'zip') == 'tif'
+    zip_name = os.path.basename(info['url'])
+    zip_path = os.path.join(backgrounds_dir, os.path.splitext(tif_name)[0] + '.zip')
+    tif_part_path = tif_path + '.part'
+    download_path = tif_part_path if direct else zip_path + '.part'
+
+    try:
+        if os.path.exists(download_path):
+            resume_mb = os.path.getsize(download_path) / (1024 * 1024)
+            _log_line(f"[RESUME] {tif_name} from {resume_mb:.1f} MB")
+        _download_with_retries(info['url'], download_path, tif_name, show_progress=False, resume=True)
+        if direct:
+            os.replace(download_path, tif_path)
+        else:
+            os.replace(download_path, zip_path)
+
+            # Stream the tif member straight to its final name. It is written
+            # under a temporary name first so an interrupted extract is not
+            # mistaken for a finished download on the next run.
             with zipfile.ZipFile(zip_path, 'r') as zf:
                 # Find the tif file in the archive
                 tif_files = [f for f in zf.namelist() if f.endswith('.tif')]
                 if not tif_files:
-                    print(f"  [ERROR] No .tif file found in {zip_name}")
-                    continue
+                    raise ValueError(f"no .tif file found in {zip_name}")
 
-                # Extract to temp location and move to proper name
-                zf.extract(tif_files[0], backgrounds_dir)
-                extracted_path = os.path.join(backgrounds_dir, tif_files[0])
-                if extracted_path != tif_path:
-                    shutil.move(extracted_path, tif_path)
+                with zf.open(tif_files[0]) as src, open(tif_part_path, 'wb') as dst:
+                    shutil.copyfileobj(src, dst, COPY_BUFFER_SIZE)
+                os.replace(tif_part_path, tif_path)
 
             # Clean up zip file
             os.remove(zip_path)
-            print(f"  [OK] {tif_name}")
+        _log_line(f"[OK] {tif_name}")
+
+    except Exception as e:
+        _log_line(f"[ERROR] Failed to download {tif_name}: {e}")
+        # Clean up partial files, except a partial download, which is kept to resume
+        for partial in (zip_path, tif_part_path):
+            if partial != download_path and os.path.exists(partial):
+                os.remove(partial)
+        if os.path.exists(download_path):
+            _log_line(f"  Partial download kept; rerun --init to resume {tif_name}")
+
+
+def _wait_for_downloads(pool, futures):
+    """
+    Wait for each future in turn, re-raising anything its worker raised.
+
+    On Ctrl-C, set _DOWNLOAD_CANCEL so running downloads stop at their next
+    chunk, and cancel the ones not yet started.
+    """
+    try:
+        for future in futures:
+            future.result()
+    except KeyboardInterrupt:
+        _DOWNLOAD_CANCEL.set()
+        pool.shutdown(cancel_futures=True)
+        raise
 
-        except Exception as e:
-            print(f"  [ERROR] Failed to download {tif_name}: {e}")
-            # Clean up partial files
-            if os.path.exists(zip_path):
-                os.remove(zip_path)
 
+def download_backgrounds():
+    """Download Natural Earth background images to the data/backgrounds directory."""
+    # Determine backgrounds directory
+    backgrounds_dir = os.path.join(_get_data_dir(), 'backgrounds')
+
+    os.makedirs(backgrounds_dir, exist_ok=True)
+
+    print(f"Downloading Natural Earth backgrounds to: {backgrounds_dir}")
     print()
-    print("Background download complete.")
 
+    # Each file is an independent HTTP stream, so fetch several at once
+    with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as pool:
+        futures = [
+            pool.submit(_download_one, tif_name, info, backgrounds_dir)
+            for tif_name, info in BACKGROUND_DOWNLOADS.items()
+        ]
+        _wait_for_downloads(pool, futures)
 
-def download_vectors():
-    """Download Natural Earth vector data (rivers, etc.) to the data directory."""
-    data_dir = _get_data_dir()
+    print()
+    print("Background download complete.")
 
-    for name, info in VECTOR_DOWNLOADS.items():
-        target_dir = os.path.join(data_dir, info['subdir'])
-        os.makedirs(target_dir, exist_ok=True)
 
-        shp_path = os.path.join(target_dir, f"{name}.shp")
-        if os.path.exists(shp_path):
-            print(f"[SKIP] {name} already exists")
-            continue
+def _extract_members(zip_path, target_dir):
+    """
+    Stream each file in a zip into target_dir, flattening member paths.
 
-        print(f"[DOWNLOAD] {info['description']}")
-        zip_path = os.path.join(target_dir, os.path.basename(info['url']))
+    Members already on disk are kept, so a rerun after a partial extract only
+    writes what is missing. Each member goes through a temporary name, so
+    anything on disk is complete. The .shp, which download_vectors() checks
+    for, is written last.
+    """
+    with zipfile.ZipFile(zip_path, 'r') as zf:
+        members = [m for m in zf.infolist() if not m.is_dir()]
+        members.sort(key=lambda m: m.filename.endswith('.shp'))
+        for member in members:
+            dst_path = os.path.join(target_dir, os.path.basename(member.filename))
+            if os.path.exists(dst_path):
+                continue
+            part_path = dst_path + '.part'
+            with zf.open(member) as src, open(part_path, 'wb') as dst:
+                shutil.copyfileobj(src, dst, COPY_BUFFER_SIZE)
+            os.replace(part_path, dst_path)
+
+
+def _download_vector(name, info, data_dir):
+    """Download one vector dataset zip and extract it into its subdirectory."""
+    target_dir = os.path.join(data_dir, info['subdir'])
+    os.makedirs(target_dir, exist_ok=True)
+
+    shp_path = os.path.join(target_dir, f"{name}.shp")
+    if os.path.exists(shp_path):
+        _log_line(f"[SKIP] {name} already exists")
+        return
 
-        try:
-            urllib.request.urlretrieve(info['url'], zip_path)
-            with zipfile.ZipFile(zip_path, 'r') as zf:
-                zf.extractall(target_dir)
+    _log_line(f"[DOWNLOAD] {info['description']}")
+    zip_path = os.path.join(target_dir, os.path.basename(info['url']))
+
+    try:
+        _download_with_retries(info['url'], zip_path, name, show_progress=False)
+        _extract_members(zip_path, target_dir)
+        _log_line(f"[OK] {name}")
+    except Exception as e:
+        _log_line(f"[ERROR] {name}: {e}")
+    finally:
+        if os.path.exists(zip_path):
             os.remove(zip_path)
-            print(f"[OK] {name}")
-        except Exception as e:
-            print(f"[ERROR] {name}: {e}")
+
+
+def download_vectors():
+    """Download Natural Earth vector data (rivers, etc.) to the data directory."""
+    data_dir = _get_data_dir()
+
+    # Independent downloads, fetched concurrently like the backgrounds
+    with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as pool:
+        futures = [
+            pool.submit(_download_vector, name, info, data_dir)
+            for name, info in VECTOR_DOWNLOADS.items()
+        ]
+        _wait_for_downloads(pool, as_completed(futures))
 
 
 def _render_scale_bar(ax, extent, position='bottom-left'):
@@ -182,8 +395,9 @@ def _render_scale_bar(ax, extent, position='bottom-left'):
         extent: [west, east, south, north] in degrees
         position: 'bottom-left', 'bottom-right', 'top-left', 'top-right'
     """
-    import math
+    import cartopy.crs as ccrs
     import matplotlib.patches as mpatches
+    from matplotlib.collections import LineCollection, PatchCollection
 
     west, east, south, north = extent
     map_width_deg = east - west
@@ -199,9 +413,12 @@ def _render_scale_bar(ax, extent, position='bottom-left'):
     # Choose a nice round scale length (aim for ~15% of map width)
     target_km = km_per_deg * map_width_deg * 0.15
 
-    # Round to nice values
-    nice_values = [1, 2, 5, 10, 20, 25, 50, 100, 200, 250, 500, 1000]
-    scale_km = min(nice_values, key=lambda x: abs(x - target_km))
+    # Round to the closest nice value: one of the two neighbours of target_km
+    # (the lower one on a tie)
+    i = bisect.bisect_left(NICE_SCALE_KM, target_km)
+    lower = NICE_SCALE_KM[max(0, i - 1)]
+    upper = NICE_SCALE_KM[min(len(NICE_SCALE_KM) - 1, i)]
+    scale_km = lower if target_km - lower <= upper - target_km else upper
     scale_deg = scale_km / km_per_deg
 
     # Convert to miles
@@ -221,19 +438,20 @@ def _render_scale_bar(ax, extent, position='bottom-left'):
     else:
         bar_y = north - map_height_deg * margin - bar_height_deg * 6
 
-    # Draw the scale bar (alternating black/white segments)
+    # Draw the scale bar (alternating black/white segments) as one collection,
+    # so the projection transform is resolved once rather than per segment
     num_segments = 4
     seg_width = scale_deg / num_segments
+    plate_carree = ccrs.PlateCarree()
 
-    for i in range(num_segments):
-        color = 'black' if i % 2 == 0 else 'white'
-        rect = mpatches.Rectangle(
-            (bar_x + i * seg_width, bar_y),
-            seg_width, bar_height_deg,
-            facecolor=color, edgecolor='black', linewidth=0.5,
-            transform=ccrs.PlateCarree(), zorder=10
-        )
-        ax.add_patch(rect)
+    segments = [mpatches.Rectangle((bar_x + i * seg_width, bar_y), seg_width, bar_height_deg)
+                for i in range(num_segments)]
+    ax.add_collection(PatchCollection(
+        segments,
+        facecolors=['black' if i % 2 == 0 else 'white' for i in range(num_segments)],
+        edgecolors='black', linewidths=0.5,
+        transform=plate_carree, zorder=10,
+    ))
 
     # Add labels
     label_y = bar_y + bar_height_deg * 1.5
@@ -242,18 +460,74 @@ def _render_scale_bar(ax, extent, position='bottom-left'):
     km_text = f"{scale_km} km" if scale_km >= 1 else f"{int(scale_km * 1000)} m"
     ax.text(bar_x + scale_deg / 2, label_y, km_text,
             ha='center', va='bottom', fontsize=7, fontweight='bold',
-            transform=ccrs.PlateCarree(), zorder=10)
+            transform=plate_carree, zorder=10)
 
     # Miles label (below km)
     miles_text = f"{scale_miles:.0f} miles" if scale_miles >= 1 else f"{scale_miles:.1f} miles"
     ax.text(bar_x + scale_deg / 2, bar_y - bar_height_deg * 0.5, miles_text,
             ha='center', va='top', fontsize=6, color='#555555',
-            transform=ccrs.PlateCarree(), zorder=10)
+            transform=plate_carree, zorder=10)
+
+    # Tick marks at ends, as one collection (projecting caps, like ax.plot)
+    tick_top = bar_y + bar_height_deg * 1.3
+    ax.add_collection(LineCollection(
+        [[(x, bar_y), (x, tick_top)] for x in (bar_x, bar_x + scale_deg)],
+        colors='black', linewidths=0.5, capstyle='projecting',
+        transform=plate_carree, zorder=10,
+    ))
+
+
+def _save_raster(fig, out_file, dpi, metadata, fmt='png'):
+    """
+    Render fig with Agg and encode the canvas buffer straight to PNG or JPEG.
+
+    Equivalent to fig.savefig() for these formats. The map is opaque, though,
+    so when the alpha channel is uniformly 255 it is dropped, giving the
+    encoder a quarter less data and a smaller file. JPEG goes through
+    Pillow's libjpeg(-turbo) at JPEG_QUALITY and has no text metadata.
+
+    Args:
+        fig: Matplotlib figure on the Agg canvas
+        out_file: Output path
+        dpi: Output resolution
+        metadata: Dict of PNG text chunks (Title, Author, ...)
+        fmt: 'png' or 'jpeg'
+    """
+    import numpy as np
+    from PIL import Image, PngImagePlugin
+
+    fig.set_dpi(dpi)
+    fig.canvas.draw()
+    rgba = np.asarray(fig.canvas.buffer_rgba())
+    if fmt == 'jpeg' or rgba[..., 3].min() == 255:
+        img = Image.fromarray(rgba[..., :3])
+    else:
+        img = Image.fromarray(rgba)
+
+    if fmt == 'jpeg':
+        img.save(out_file, format='jpeg', dpi=(dpi, dpi), quality=JPEG_QUALITY)
+        return
+
+    pnginfo = PngImagePlugin.PngInfo()
+    for key, value in metadata.items():
+        pnginfo.add_text(key, value)
+    img.save(out_file, format='png', dpi=(dpi, dpi), pnginfo=pnginfo,
+             compress_level=PNG_COMPRESS_LEVEL)
+
 
-    # Tick marks at ends
-    for x in [bar_x, bar_x + scale_deg]:
-        ax.plot([x, x], [bar_y, bar_y + bar_height_deg * 1.3],
-                color='black', linewidth=0.5, transform=ccrs.PlateCarree(), zorder=10)
+def _background_crop(extent, margin=BACKGROUND_CROP_MARGIN_DEG):
+    """
+    Extent to crop the global background raster to for a map.
+
+    Pads the map extent by margin degrees and clamps it to the globe.
+    Returns None when the padded extent covers the whole raster anyway.
+    """
+    west, east, south, north = extent
+    crop = [max(west - margin, -180), min(east + margin, 180),
+            max(south - margin, -90), min(north + margin, 90)]
+    if crop == [-180, 180, -90, 90]:
+        return None
+    return crop
 
 
 def _validate_dimensions(dimensions_px, dpi=300):
@@ -276,27 +550,25 @@ def _validate_dimensions(dimensions_px, dpi=300):
         return
 
     width_px, height_px = dimensions_px
-    aspect_ratio = width_px / height_px
-    expected_ratio = 1.5  # 3:2
 
-    # Check 3:2 aspect ratio
-    tolerance = 0.01
-    if abs(aspect_ratio - expected_ratio) > tolerance:
+    # Check 3:2 aspect ratio exactly, by cross-multiplying (a float ratio with
+    # a tolerance let e.g. 3601x2400 through)
+    if width_px * 2 != height_px * 3:
         raise ValueError(
             f"Dimensions must maintain 3:2 aspect ratio.\n"
-            f"Got {width_px}×{height_px} (ratio: {aspect_ratio:.3f}), "
+            f"Got {width_px}×{height_px} (ratio: {width_px / height_px:.4f}), "
             f"expected ratio: 1.5"
         )
 
     # Check divisibility by DPI (for clean inch conversion)
-    if width_px % dpi != 0 or height_px % dpi != 0:
+    if width_px % dpi or height_px % dpi:
         logger.warning(f"Dimensions {width_px}x{height_px} not evenly divisible by DPI ({dpi})")
         logger.warning(f"  Fractional inches: {width_px/dpi:.2f}\" x {height_px/dpi:.2f}\"")
-        logger.warning(f"  Recommended: 3600x2400, 4800x3200, 6000x4000")
+        logger.warning("  Recommended: " + ", ".join(f"{w}x{h}" for w, h in sorted(RECOMMENDED_DIMENSIONS)))
 
     # Check divisibility by tile size (200px) for clean tiling
     tile_size = 200
-    if width_px % tile_size != 0 or height_px % tile_size != 0:
+    if width_px % tile_size or height_px % tile_size:
         logger.warning(f"Dimensions {width_px}x{height_px} not evenly divisible by tile size ({tile_size}px)")
         logger.warning("  This may result in cropped border patterns")
 
@@ -310,6 +582,8 @@ def main():
     parser.add_argument('--init', action='store_true', help='Download Natural Earth background images')
     parser.add_argument('--res', choices=['dev', 'low', 'med', 'high', 'med-yellow', 'high-yellow', 'med-grey', 'med-bw'], help='Override background resolution')
     parser.add_argument('--output', help='Override output filename')
+    parser.add_argument('--output-format', choices=['png', 'jpeg'],
+                        help='Output image format (replaces the output filename extension)')
     parser.add_argument('--debug', action='store_true', help='Enable debug logging')
     parser.add_argument('--debug-river-candidates', action='store_true', help='Render all river label candidates')
     parser.add_argument('--debug-anchor-circles', action='store_true', help='Render anchor circles for all cities and events')
@@ -331,315 +605,376 @@ def main():
         parser.error('manifest is required (unless using --init)')
         return
 
-    logger.info(f"Loading manifest: {args.manifest}")
-
-    # Remove limit on large file sizes for high-res images
+    # Rendering dependencies are imported here so that --init and --help
+    # don't pay for loading matplotlib and cartopy.
+    from PIL import Image
+    # Remove limit on large file sizes for high-res images, before anything
+    # else that might decode one is imported
     Image.MAX_IMAGE_PIXELS = None
+    # Output is always a file, so select Agg before pyplot probes for an
+    # interactive backend
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import matplotlib.patches as mpatches
+    from matplotlib.collections import PatchCollection
+    import cartopy.crs as ccrs
+    from history_cartopy.core import load_gazetteer, load_manifest
+    from history_cartopy.labels import collect_labels, render_labels_resolved
+    from history_cartopy.events import collect_events, render_events_resolved
+    from history_cartopy.campaigns import (
+        collect_arrow_candidates, collect_campaign_labels, render_campaigns_resolved
+    )
+    from history_cartopy.territories import render_territories
+    from history_cartopy.border_styles import render_border
+    from history_cartopy.title_cartouche import render_title_cartouche, estimate_title_box_fracs
+    from history_cartopy.narrative import (
+        collect_narrative_markers, render_narrative_markers, render_narrative_box,
+        estimate_narrative_box_fracs,
+    )
+    from history_cartopy.placement import PlacementManager
+    from history_cartopy.pairing import detect_and_pair
+    from history_cartopy.styles import get_deg_per_pt
+    from history_cartopy.themes import apply_theme, CITY_LEVELS, EVENT_CONFIG
+
+    logger.info(f"Loading manifest: {args.manifest}")
 
     data_dir = _get_data_dir()
     backgrounds_dir = os.path.join(data_dir, 'backgrounds')
     polygons_dir = os.path.join(data_dir, 'polygons')
     gazetteer_path = os.path.join(data_dir, 'city-locations.yaml')
-    gazetteer, manifest = load_data(gazetteer_path, args.manifest)
-    logger.debug(f"Loaded {len(gazetteer)} locations from gazetteer")
+    manifest = load_manifest(args.manifest)
+    meta = manifest['metadata']
 
     # Apply theme — populates LABEL_STYLES, CITY_LEVELS, etc. in themes module
-    theme_name = manifest['metadata'].get('theme', 'eighties-textbook')
+    theme_name = meta.get('theme', 'eighties-textbook')
     theme = apply_theme(theme_name)
 
     # Resolve Settings (CLI > manifest > theme defaults)
-    res = args.res or manifest['metadata'].get('resolution') or theme['background']
-    out_file = args.output or manifest['metadata'].get('output', 'map.png')
-    extent = manifest['metadata']['extent']
-    border_style = manifest['metadata'].get('border_style') or theme.get('border_style')
+    res = args.res or meta.get('resolution') or theme['background']
+    out_file = args.output or meta.get('output', 'map.png')
+    if args.output_format:
+        out_file = os.path.splitext(out_file)[0] + ('.jpg' if args.output_format == 'jpeg' else '.png')
+    extent = meta['extent']
+    border_style = meta.get('border_style') or theme.get('border_style')
 
     # Get dimensions in pixels (required)
-    dimensions_px = manifest['metadata'].get('dimensions', [3600, 2400])  # Default: 3600×2400px
+    dimensions_px = meta.get('dimensions', [3600, 2400])  # Default: 3600×2400px
 
     # Validate dimensions if borders enabled
     if border_style:
         _validate_dimensions(dimensions_px, dpi=300)
 
+    # Only read once the manifest's own settings have been checked, so a
+    # bad manifest fails before the gazetteer is parsed
+    gazetteer = load_gazetteer(gazetteer_path)
+    logger.debug(f"Loaded {len(gazetteer)} locations from gazetteer")
+
     # Convert pixels to inches for matplotlib
     dpi = 300
     figsize = [dimensions_px[0] / dpi, dimensions_px[1] / dpi]
 
     # Setup Plot
-    fig = plt.figure(figsize=figsize)
-    # Small margin so graticule labels are visible and map doesn't overflow
-    margin = 0.03
-    ax = fig.add_axes([margin, margin, 1 - 2 * margin, 1 - 2 * margin],
-                      projection=ccrs.PlateCarree())
-    ax.set_extent(extent, crs=ccrs.PlateCarree())
-
-    # Background Logic (Example using Cartopy stock images)
-    # Set custom backgrounds directory for Cartopy
-    os.environ['CARTOPY_USER_BACKGROUNDS'] = backgrounds_dir
-
-    if res == 'high':
-        # This is magical - the hi-res maps from Natural Earth are perfect for the purpose
-        ax.background_img(name='ne_hyp', resolution='high')
-    elif res == 'med':
-        ax.background_img(name='ne_hyp', resolution='med')
-    elif res == 'high-yellow':
-        ax.background_img(name='ne_hyp', resolution='high-yellow')
-    elif res == 'med-yellow':
-        ax.background_img(name='ne_hyp', resolution='med-yellow')
-    elif res == 'med-grey':
-        ax.background_img(name='ne_hyp', resolution='med-grey')
-    elif res == 'med-bw':
-        ax.background_img(name='ne_hyp', resolution='med-bw')
-    elif res == 'low':
-        ax.stock_img()
-    elif res == 'dev':
-        ax.coastlines(resolution='110m')
-
-    # Graticule (lat/lon grid and labels)
-    graticule = manifest['metadata'].get('graticule', False)
-    if graticule:
-        # Support both boolean and dict config
-        if isinstance(graticule, dict):
-            show_lines = graticule.get('lines', False)
-            show_labels = graticule.get('labels', True)
-        else:
-            show_lines = False
-            show_labels = True
-
-        gl = ax.gridlines(
-            crs=ccrs.PlateCarree(),
-            draw_labels=show_labels,
-            linewidth=0.5 if show_lines else 0,
-            color='gray',
-            alpha=0.5,
-            linestyle='--'
+    fig = plt.figure(figsize=figsize, dpi=dpi)
+    try:
+        # Small margin so graticule labels are visible and map doesn't overflow
+        margin = 0.03
+        ax = fig.add_axes([margin, margin, 1 - 2 * margin, 1 - 2 * margin],
+                          projection=ccrs.PlateCarree())
+        ax.set_extent(extent, crs=ccrs.PlateCarree())
+
+        # Background Logic (Example using Cartopy stock images)
+        # Set custom backgrounds directory for Cartopy
+        os.environ['CARTOPY_USER_BACKGROUNDS'] = backgrounds_dir
+
+        # cache=True keeps each decoded TIFF in cartopy's module-level image cache,
+        # so repeated main() calls in one process (batch renders) decode it once.
+        # extent crops that cached global raster to the map before matplotlib
+        # resamples it, instead of pushing the whole world through every render.
+        bg_extent = _background_crop(extent)
+        if res == 'high':
+            # This is magical - the hi-res maps from Natural Earth are perfect for the purpose
+            ax.background_img(name='ne_hyp', resolution='high', cache=True,
+                              extent=bg_extent)
+        elif res == 'med':
+            ax.background_img(name='ne_hyp', resolution='med', cache=True,
+                              extent=bg_extent)
+        elif res == 'high-yellow':
+            ax.background_img(name='ne_hyp', resolution='high-yellow', cache=True,
+                              extent=bg_extent)
+        elif res == 'med-yellow':
+            ax.background_img(name='ne_hyp', resolution='med-yellow', cache=True,
+                              extent=bg_extent)
+        elif res == 'med-grey':
+            ax.background_img(name='ne_hyp', resolution='med-grey', cache=True,
+                              extent=bg_extent)
+        elif res == 'med-bw':
+            ax.background_img(name='ne_hyp', resolution='med-bw', cache=True,
+                              extent=bg_extent)
+        elif res == 'low':
+            ax.stock_img()
+        elif res == 'dev':
+            ax.coastlines(resolution='110m')
+
+        # Graticule (lat/lon grid and labels)
+        graticule = meta.get('graticule', False)
+        if graticule:
+            from cartopy.mpl.gridliner import LONGITUDE_FORMATTER, LATITUDE_FORMATTER
+
+            # Support both boolean and dict config
+            if isinstance(graticule, dict):
+                show_lines = graticule.get('lines', False)
+                show_labels = graticule.get('labels', True)
+            else:
+                show_lines = False
+                show_labels = True
+
+            gl = ax.gridlines(
+                crs=ccrs.PlateCarree(),
+                draw_labels=show_labels,
+                linewidth=0.5 if show_lines else 0,
+                color='gray',
+                alpha=0.5,
+                linestyle='--'
+            )
+            gl.top_labels = False      # Labels on bottom and left only
+            gl.right_labels = False
+            gl.xformatter = LONGITUDE_FORMATTER
+            gl.yformatter = LATITUDE_FORMATTER
+            gl.xlabel_style = {'size': 8, 'color': 'gray'}
+            gl.ylabel_style = {'size': 8, 'color': 'gray'}
+
+        # Run Engine
+        logger.info("Rendering territories")
+        render_territories(ax, manifest, polygons_dir)
+
+        # Create placement manager for overlap detection
+        dpp = get_deg_per_pt(ax)
+        logger.info(f"Degrees per point (dpp) = {dpp:.6f}")
+        pm = PlacementManager(dpp)
+
+        # =========================================================================
+        # TWO-PASS LABEL PLACEMENT
+        # Phase 1: COLLECT - gather city/event label candidates
+        # Phase 2a: RESOLVE ARROWS - pick gap distance for campaign arrows
+        # Phase 2b: COLLECT CAMPAIGN LABELS - generate labels from resolved arrows
+        # Phase 2c: RESOLVE ALL LABELS - greedy algorithm picks best positions
+        # Phase 3: RENDER - draw everything at resolved positions
+        # =========================================================================
+
+        # Phase 1: COLLECT (cities, rivers, regions, events)
+        logger.info("Collecting labels")
+        city_candidates, river_candidates, river_data, region_data, city_render_data = collect_labels(
+            gazetteer, manifest, pm, data_dir=data_dir, viewport_bbox=extent
         )
-        gl.top_labels = False      # Labels on bottom and left only
-        gl.right_labels = False
-        gl.xformatter = LONGITUDE_FORMATTER
-        gl.yformatter = LATITUDE_FORMATTER
-        gl.xlabel_style = {'size': 8, 'color': 'gray'}
-        gl.ylabel_style = {'size': 8, 'color': 'gray'}
-
-    # Run Engine
-    logger.info("Rendering territories")
-    render_territories(ax, manifest, polygons_dir)
-
-    # Create placement manager for overlap detection
-    dpp = get_deg_per_pt(ax)
-    logger.info(f"Degrees per point (dpp) = {dpp:.6f}")
-    pm = PlacementManager(dpp)
-
-    # =========================================================================
-    # TWO-PASS LABEL PLACEMENT
-    # Phase 1: COLLECT - gather city/event label candidates
-    # Phase 2a: RESOLVE ARROWS - pick gap distance for campaign arrows
-    # Phase 2b: COLLECT CAMPAIGN LABELS - generate labels from resolved arrows
-    # Phase 2c: RESOLVE ALL LABELS - greedy algorithm picks best positions
-    # Phase 3: RENDER - draw everything at resolved positions
-    # =========================================================================
-
-    # Phase 1: COLLECT (cities, rivers, regions, events)
-    logger.info("Collecting labels")
-    city_candidates, river_candidates, river_data, region_data, city_render_data = collect_labels(
-        gazetteer, manifest, pm, data_dir=data_dir
-    )
 
-    # Collect narrative markers (fixed elements for placement)
-    narrative_style = theme.get('narrative_style', {})
-    logger.info("Collecting narrative markers")
-    collect_narrative_markers(manifest, gazetteer, pm, narrative_style=narrative_style)
+        # Collect narrative markers (fixed elements for placement)
+        narrative_style = theme.get('narrative_style', {})
+        logger.info("Collecting narrative markers")
+        collect_narrative_markers(manifest, gazetteer, pm, narrative_style=narrative_style)
 
-    logger.info("Collecting events")
-    event_candidates, event_render_data = collect_events(
-        gazetteer, manifest, pm, data_dir=data_dir
-    )
+        logger.info("Collecting events")
+        event_candidates, event_render_data = collect_events(
+            gazetteer, manifest, pm, data_dir=data_dir
+        )
 
-    # Auto-register all events in gazetteer so campaign paths can reference them by text
-    for ev in event_render_data:
-        gazetteer[ev['event_id']] = list(ev['coords'])
-    event_levels = {ev['event_id']: 2 for ev in event_render_data}
+        # Auto-register all events in gazetteer so campaign paths can reference them by text.
+        # Readers unpack or copy gazetteer coords, so the event's tuple is stored as is.
+        event_levels = {}
+        for ev in event_render_data:
+            event_id = ev['event_id']
+            gazetteer[event_id] = ev['coords']
+            event_levels[event_id] = 2
+
+        # Detect and pair close city+event label combinations
+        logger.info("Detecting city+event label pairs")
+        paired_candidates, city_candidates, event_candidates = detect_and_pair(
+            city_candidates, event_candidates, event_render_data, pm
+        )
+        logger.info(f"Found {len(paired_candidates)} city+event pair(s)")
 
-    # Detect and pair close city+event label combinations
-    logger.info("Detecting city+event label pairs")
-    paired_candidates, city_candidates, event_candidates = detect_and_pair(
-        city_candidates, event_candidates, event_render_data, pm
-    )
-    logger.info(f"Found {len(paired_candidates)} city+event pair(s)")
+        # Collect arrow candidates (with 2x, 3x, 4x gap variants)
+        logger.info("Collecting campaign arrow candidates")
+        arrow_candidates, campaign_render_data = collect_arrow_candidates(
+            gazetteer, manifest, pm, event_levels=event_levels
+        )
 
-    # Collect arrow candidates (with 2x, 3x, 4x gap variants)
-    logger.info("Collecting campaign arrow candidates")
-    arrow_candidates, campaign_render_data = collect_arrow_candidates(
-        gazetteer, manifest, pm, event_levels=event_levels
-    )
+        # Phase 2a: RESOLVE ARROWS
+        # City dots/icons are already in PM from collect_labels(), so arrows can avoid them
+        logger.info("Resolving arrow gaps")
+        resolved_arrows = pm.resolve_arrows(arrow_candidates)
+        logger.info(f"Resolved {len(resolved_arrows)} arrow gaps")
 
-    # Phase 2a: RESOLVE ARROWS
-    # City dots/icons are already in PM from collect_labels(), so arrows can avoid them
-    logger.info("Resolving arrow gaps")
-    resolved_arrows = pm.resolve_arrows(arrow_candidates)
-    logger.info(f"Resolved {len(resolved_arrows)} arrow gaps")
-
-    # Update campaign_render_data with resolved geometry
-    for data in campaign_render_data:
-        arrow_id = data['arrow_id']
-        if arrow_id in resolved_arrows:
-            data['geometry'] = resolved_arrows[arrow_id].resolved_geometry
-
-    # Phase 2b: COLLECT CAMPAIGN LABELS (after arrows resolved)
-    logger.info("Collecting campaign labels from resolved arrows")
-    campaign_candidates = collect_campaign_labels(manifest, resolved_arrows, pm)
-
-    # Register title cartouche and narrative box as map_box blockers so
-    # region labels avoid them during greedy resolution (Phase 2c).
-    # Uses pure approximation (fontsize * 0.6) — no renderer needed.
-    west, east, south, north = extent
-    lon_span = east - west
-    lat_span = north - south
+        # Update campaign_render_data with resolved geometry
+        render_data_by_arrow = {data['arrow_id']: data for data in campaign_render_data}
+        for arrow_id, arrow in resolved_arrows.items():
+            render_data_by_arrow[arrow_id]['geometry'] = arrow.resolved_geometry
 
-    def _frac_to_bbox(bx, by, bw, bh):
-        return (west + bx * lon_span, south + by * lat_span,
-                west + (bx + bw) * lon_span, south + (by + bh) * lat_span)
+        # Phase 2b: COLLECT CAMPAIGN LABELS (after arrows resolved)
+        logger.info("Collecting campaign labels from resolved arrows")
+        campaign_candidates = collect_campaign_labels(manifest, resolved_arrows, pm)
 
-    _cartouche_style = theme.get('cartouche_style', {})
-    _narrative_style = theme.get('narrative_style', {})
+        # Register title cartouche and narrative box as map_box blockers so
+        # region labels avoid them during greedy resolution (Phase 2c).
+        # Uses pure approximation (fontsize * 0.6) — no renderer needed.
+        west, east, south, north = extent
+        lon_span = east - west
+        lat_span = north - south
 
-    if manifest['metadata'].get('title') and _cartouche_style:
-        _tb = estimate_title_box_fracs(manifest, dimensions_px, _cartouche_style)
-        if _tb:
-            pm.add_fixed_rect('map_title_box', _frac_to_bbox(*_tb))
-            logger.debug(f"Registered map_title_box blocker: fracs={_tb}")
+        def _frac_to_bbox(bx, by, bw, bh):
+            return (west + bx * lon_span, south + by * lat_span,
+                    west + (bx + bw) * lon_span, south + (by + bh) * lat_span)
 
-    if manifest.get('narrative') and _narrative_style and _cartouche_style:
+        _cartouche_style = theme.get('cartouche_style', {})
+        _narrative_style = theme.get('narrative_style', {})
+
+        # Title box fractions, shared by both blockers
         _tb_fracs = estimate_title_box_fracs(manifest, dimensions_px, _cartouche_style) \
-                    if manifest['metadata'].get('title') else None
-        _nb = estimate_narrative_box_fracs(manifest, dimensions_px, _cartouche_style,
-                                            _narrative_style, _tb_fracs)
-        if _nb:
-            pm.add_fixed_rect('map_narrative_box', _frac_to_bbox(*_nb))
-            logger.debug(f"Registered map_narrative_box blocker: fracs={_nb}")
-
-    # Phase 2c: RESOLVE ALL LABELS
-    logger.info("Resolving label overlaps")
-    all_candidates = city_candidates + river_candidates + campaign_candidates + event_candidates + paired_candidates
-    resolved_positions = pm.resolve_greedy(all_candidates)
-    logger.info(f"Resolved {len(resolved_positions)} label positions")
-
-    # Phase 3: RENDER
-    logger.info("Rendering labels")
-    render_labels_resolved(ax, city_render_data, river_data, region_data,
-                           resolved_positions, gazetteer, manifest, data_dir=data_dir,
-                           river_candidates=river_candidates,
-                           debug_river_candidates=args.debug_river_candidates)
-
-    logger.info("Rendering campaigns")
-    render_campaigns_resolved(ax, campaign_render_data, resolved_positions)
-
-    logger.info("Rendering events")
-    render_events_resolved(ax, event_render_data, resolved_positions,
-                           data_dir=data_dir, manifest=manifest)
-
-    # Debug: render anchor circles for all cities and events
-    if args.debug_anchor_circles:
-        import matplotlib.patches as mpatches
-        for city in city_render_data:
-            level = city['level']
-            radius_deg = CITY_LEVELS.get(level, CITY_LEVELS[2])['anchor_radius'] * dpp
-            lon, lat = city['coords']
-            ax.add_patch(mpatches.Circle(
-                (lon, lat), radius=radius_deg,
-                facecolor='none', edgecolor='#cc0000',
-                linewidth=0.7, linestyle='--', alpha=0.7,
-                transform=ccrs.PlateCarree(), zorder=10
-            ))
-        for ev in event_render_data:
-            radius_deg = EVENT_CONFIG['anchor_radius'] * dpp
-            lon, lat = ev['coords']
-            ax.add_patch(mpatches.Circle(
-                (lon, lat), radius=radius_deg,
-                facecolor='none', edgecolor='#0055cc',
-                linewidth=0.7, linestyle='--', alpha=0.7,
-                transform=ccrs.PlateCarree(), zorder=10
-            ))
-
-    # Debug: render placement bounding boxes for all elements
-    if args.debug_placement:
-        import matplotlib.patches as mpatches
-        bbox_colors = {
-            'city_label':     '#cc0000',
-            'campaign_arrow': '#0044cc',
-            'campaign_label': '#007700',
-            'event_label':    '#cc6600',
-            'event_icon':     '#cc6600',
-            'dot':            '#888888',
-            'map_box':        '#880088',
-            'region':         '#00aacc',
-            'river':          '#0088cc',
+                    if meta.get('title') and _cartouche_style else None
+        if _tb_fracs:
+            pm.add_fixed_rect('map_title_box', _frac_to_bbox(*_tb_fracs))
+            logger.debug(f"Registered map_title_box blocker: fracs={_tb_fracs}")
+
+        if manifest.get('narrative') and _narrative_style and _cartouche_style:
+            _nb = estimate_narrative_box_fracs(manifest, dimensions_px, _cartouche_style,
+                                                _narrative_style, _tb_fracs)
+            if _nb:
+                pm.add_fixed_rect('map_narrative_box', _frac_to_bbox(*_nb))
+                logger.debug(f"Registered map_narrative_box blocker: fracs={_nb}")
+
+        # Phase 2c: RESOLVE ALL LABELS
+        logger.info("Resolving label overlaps")
+        # resolve_greedy() sorts its input into a new list anyway, so chain the
+        # candidate lists instead of concatenating them into another one first
+        resolved_positions = pm.resolve_greedy(chain(
+            city_candidates, river_candidates, campaign_candidates, event_candidates, paired_candidates
+        ))
+        logger.info(f"Resolved {len(resolved_positions)} label positions")
+
+        # Phase 3: RENDER
+        logger.info("Rendering labels")
+        render_labels_resolved(ax, city_render_data, river_data, region_data,
+                               resolved_positions, gazetteer, manifest, data_dir=data_dir,
+                               river_candidates=river_candidates,
+                               debug_river_candidates=args.debug_river_candidates)
+
+        logger.info("Rendering campaigns")
+        render_campaigns_resolved(ax, campaign_render_data, resolved_positions)
+
+        logger.info("Rendering events")
+        render_events_resolved(ax, event_render_data, resolved_positions,
+                               data_dir=data_dir, manifest=manifest)
+
+        # Debug: render anchor circles for all cities and events
+        if args.debug_anchor_circles:
+            # One collection per colour rather than an artist per anchor
+            city_circles = [
+                mpatches.Circle(city['coords'],
+                                radius=CITY_LEVELS.get(city['level'], CITY_LEVELS[2])['anchor_radius'] * dpp)
+                for city in city_render_data
+            ]
+            event_radius_deg = EVENT_CONFIG['anchor_radius'] * dpp
+            event_circles = [mpatches.Circle(ev['coords'], radius=event_radius_deg)
+                             for ev in event_render_data]
+            for circles, color in ((city_circles, '#cc0000'), (event_circles, '#0055cc')):
+                if circles:
+                    ax.add_collection(PatchCollection(
+                        circles,
+                        facecolor='none', edgecolor=color,
+                        linewidth=0.7, linestyle='--', alpha=0.7,
+                        transform=ccrs.PlateCarree(), zorder=10
+                    ))
+
+        # Debug: render placement bounding boxes for all elements
+        if args.debug_placement:
+            bbox_colors = {
+                'city_label':     '#cc0000',
+                'campaign_arrow': '#0044cc',
+                'campaign_label': '#007700',
+                'event_label':    '#cc6600',
+                'event_icon':     '#cc6600',
+                'dot':            '#888888',
+                'map_box':        '#880088',
+                'region':         '#00aacc',
+                'river':          '#0088cc',
+            }
+            for elem in pm.elements.values():
+                color = bbox_colors.get(elem.type, '#999999')
+                x1, y1, x2, y2 = elem.bbox
+                ax.add_patch(mpatches.Rectangle(
+                    (x1, y1), x2 - x1, y2 - y1,
+                    facecolor='none', edgecolor=color,
+                    linewidth=0.5, alpha=0.8,
+                    transform=ccrs.PlateCarree(), zorder=20,
+                ))
+
+        # Render narrative markers on map
+        logger.info("Rendering narrative markers")
+        cartouche_style_for_narr = theme.get('cartouche_style', {})
+        bg_color = cartouche_style_for_narr.get('background_color', 'white')
+        render_narrative_markers(ax, manifest, gazetteer, narrative_style, bg_color, dpp)
+
+        # Scale bar
+        scale_bar = meta.get('scale_bar', False)
+        if scale_bar:
+            position = scale_bar if isinstance(scale_bar, str) else 'bottom-left'
+            _render_scale_bar(ax, extent, position=position)
+
+        # Render borders (must be after all map elements so borders are on top)
+        overlay_ax = None
+        if border_style:
+            borders_dir = os.path.join(data_dir, 'borders')
+            overlay_ax = render_border(ax, fig, border_style, borders_dir, dimensions_px, dpi=dpi)
+
+        # Render title cartouche inside the map
+        cartouche_style = theme.get('cartouche_style', {})
+        title_box_bounds = None
+        if meta.get('title') and cartouche_style:
+            title_box_bounds = render_title_cartouche(overlay_ax, fig, manifest, dimensions_px, cartouche_style)
+
+        # Render narrative box
+        logger.info("Rendering narrative box")
+        if manifest.get('narrative') and narrative_style:
+            render_narrative_box(overlay_ax, fig, ax, manifest, dimensions_px,
+                                 cartouche_style, narrative_style,
+                                 title_box_bounds=title_box_bounds)
+
+        # Save
+        # Don't use bbox_inches='tight' - we want exact dimensions as specified
+        title_parts = [meta.get('title', ''), meta.get('subtitle', '')]
+        author = os.environ.get('USER', os.environ.get('USERNAME', 'unknown'))
+        png_metadata = {
+            'Title':         ' — '.join(p for p in title_parts if p),
+            'Author':        author,
+            'Creation Time': date.today().isoformat(),
+            'Software':      'history-cartopy https://github.com/chetanvaity/history-cartopy',
+            'Comment':       f"Generated from {os.path.basename(args.manifest)}",
         }
-        for elem in pm.elements.values():
-            color = bbox_colors.get(elem.type, '#999999')
-            x1, y1, x2, y2 = elem.bbox
-            ax.add_patch(mpatches.Rectangle(
-                (x1, y1), x2 - x1, y2 - y1,
-                facecolor='none', edgecolor=color,
-                linewidth=0.5, alpha=0.8,
-                transform=ccrs.PlateCarree(), zorder=20,
-            ))
-
-    # Render narrative markers on map
-    logger.info("Rendering narrative markers")
-    cartouche_style_for_narr = theme.get('cartouche_style', {})
-    bg_color = cartouche_style_for_narr.get('background_color', 'white')
-    render_narrative_markers(ax, manifest, gazetteer, narrative_style, bg_color, dpp)
-
-    # Scale bar
-    scale_bar = manifest['metadata'].get('scale_bar', False)
-    if scale_bar:
-        position = scale_bar if isinstance(scale_bar, str) else 'bottom-left'
-        _render_scale_bar(ax, extent, position=position)
-
-    # Render borders (must be after all map elements so borders are on top)
-    overlay_ax = None
-    if border_style:
-        borders_dir = os.path.join(data_dir, 'borders')
-        overlay_ax = render_border(ax, fig, border_style, borders_dir, dimensions_px, dpi=dpi)
-
-    # Render title cartouche inside the map
-    cartouche_style = theme.get('cartouche_style', {})
-    title_box_bounds = None
-    if manifest['metadata'].get('title') and cartouche_style:
-        title_box_bounds = render_title_cartouche(overlay_ax, fig, manifest, dimensions_px, cartouche_style)
-
-    # Render narrative box
-    logger.info("Rendering narrative box")
-    if manifest.get('narrative') and narrative_style:
-        render_narrative_box(overlay_ax, fig, ax, manifest, dimensions_px,
-                             cartouche_style, narrative_style,
-                             title_box_bounds=title_box_bounds)
-
-    # Save
-    # Don't use bbox_inches='tight' - we want exact dimensions as specified
-    meta = manifest.get('metadata', {})
-    title_parts = [meta.get('title', ''), meta.get('subtitle', '')]
-    author = os.environ.get('USER', os.environ.get('USERNAME', 'unknown'))
-    png_metadata = {
-        'Title':         ' — '.join(p for p in title_parts if p),
-        'Author':        author,
-        'Creation Time': date.today().isoformat(),
-        'Software':      'history-cartopy https://github.com/chetanvaity/history-cartopy',
-        'Comment':       f"Generated from {os.path.basename(args.manifest)}",
-    }
-
-    # Faint watermark — bottom-right, nearly invisible without enhancement
-    fig.text(
-        0.9, 0.1,
-        f"{author} / history_cartopy",
-        ha='right', va='bottom',
-        fontsize=5, color='gray', alpha=0.12,
-        transform=fig.transFigure,
-    )
 
-    logger.info(f"Saving map to {out_file}")
-    plt.savefig(out_file, dpi=dpi, metadata=png_metadata)
-    logger.info(f"Map saved to {out_file}")
+        # Faint watermark — bottom-right, nearly invisible without enhancement
+        fig.text(
+            0.9, 0.1,
+            f"{author} / history_cartopy",
+            ha='right', va='bottom',
+            fontsize=5, color='gray', alpha=0.12,
+            transform=fig.transFigure,
+        )
+
+        logger.info(f"Saving map to {out_file}")
+        raster_format = RASTER_FORMATS.get(os.path.splitext(out_file)[1].lower())
+        if raster_format:
+            _save_raster(fig, out_file, dpi, png_metadata, fmt=raster_format)
+        else:
+            fig.savefig(out_file, dpi=dpi, metadata=png_metadata)
+        logger.info(f"Map saved to {out_file}")
+    finally:
+        # Release the figure and the image arrays its artists hold even if
+        # rendering fails, so repeated main() calls in one process (batch
+        # renders) don't accumulate figures. Figures are full of reference
+        # cycles, so collect now rather than whenever the GC next runs.
+        plt.close(fig)
+        gc.collect()
+
 
 if __name__ == "__main__":
     main()
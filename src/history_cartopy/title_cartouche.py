@@ -187,20 +187,11 @@ def render_title_cartouche(overlay_ax, fig, manifest, dimensions_px, cartouche_s
     else:
         box_y = border_margin_y + inset_y
 
-    # Draw white background (covers everything under the cartouche)
-    bg_rect = mpatches.FancyBboxPatch(
-        (box_x, box_y), box_w, box_h,
-        boxstyle="square,pad=0",
-        facecolor=bg_color, edgecolor='none',
-        transform=overlay_ax.transAxes, zorder=8.0,
-    )
-    overlay_ax.add_patch(bg_rect)
-
-    # Draw outer border rectangle
+    # Draw background and outer border as one patch (fill, then stroke)
     outer_rect = mpatches.FancyBboxPatch(
         (box_x, box_y), box_w, box_h,
         boxstyle="square,pad=0",
-        facecolor='none', edgecolor=line_color, linewidth=outer_lw,
+        facecolor=bg_color, edgecolor=line_color, linewidth=outer_lw,
         transform=overlay_ax.transAxes, zorder=8.1,
     )
     overlay_ax.add_patch(outer_rect)
@@ -0,0 +1,63 @@
+"""Tests for label collection - viewport culling of cities."""
+
+import pytest
+from history_cartopy.themes import apply_theme
+from history_cartopy.placement import PlacementManager
+from history_cartopy.labels import collect_labels, VIEWPORT_PAD_PTS
+
+
+class TestViewportCulling:
+    """Tests for skipping cities anchored outside the viewport."""
+
+    DPP = 0.01
+    EXTENT = [0, 10, 0, 10]
+
+    @pytest.fixture(autouse=True)
+    def theme(self):
+        apply_theme('eighties-textbook')
+
+    @pytest.fixture
+    def collected(self, tmp_path):
+        pad_deg = VIEWPORT_PAD_PTS * self.DPP
+        gazetteer = {
+            'Inside': [5, 5],
+            'InPad': [10 + pad_deg / 2, 5],
+            'Beyond': [10 + pad_deg * 2, 5],
+        }
+        manifest = {
+            'metadata': {'extent': self.EXTENT},
+            'labels': {'cities': [{'name': name, 'icon': 'city'} for name in gazetteer]},
+        }
+        pm = PlacementManager(dpp=self.DPP)
+        city_candidates, _, _, _, city_render_data = collect_labels(
+            gazetteer, manifest, pm, data_dir=str(tmp_path), viewport_bbox=self.EXTENT
+        )
+        return pm, city_candidates, city_render_data
+
+    @pytest.mark.parametrize('name', ['Inside', 'InPad'])
+    def test_city_within_pad_keeps_full_treatment(self, collected, name):
+        """Cities in the viewport or its pad get a candidate, dot and icon."""
+        pm, city_candidates, city_render_data = collected
+        assert f"city_label_{name}" in [c.id for c in city_candidates]
+        assert name in [r['name'] for r in city_render_data]
+        assert f"city_dot_{name}" in pm.elements
+        assert f"city_icon_{name}" in pm.elements
+
+    def test_city_beyond_pad_is_skipped(self, collected):
+        """Cities beyond the pad get no candidate, dot or icon."""
+        pm, city_candidates, city_render_data = collected
+        assert "city_label_Beyond" not in [c.id for c in city_candidates]
+        assert "Beyond" not in [r['name'] for r in city_render_data]
+        assert "city_dot_Beyond" not in pm.elements
+        assert "city_icon_Beyond" not in pm.elements
+
+    def test_no_viewport_keeps_every_city(self, tmp_path):
+        """Without a viewport, far-away cities are still collected."""
+        manifest = {
+            'metadata': {'extent': self.EXTENT},
+            'labels': {'cities': [{'name': 'Far'}]},
+        }
+        pm = PlacementManager(dpp=self.DPP)
+        city_candidates, _, _, _, _ = collect_labels({'Far': [80, 40]}, manifest, pm)
+        assert [c.id for c in city_candidates] == ["city_label_Far"]
+        assert "city_dot_Far" in pm.elements
@@ -86,6 +86,31 @@ class TestPlacementManager:
         # Label positioned at offset point
         assert elem.offset == (0.1, 0.05)
 
+    def test_add_label_stores_alignment(self, manager):
+        """Alignment passed to add_label should be kept for rendering."""
+        elem = manager.add_label(
+            id='test',
+            coords=(0, 0),
+            text='Test',
+            fontsize=10,
+            ha='right',
+            va='top',
+        )
+        assert elem.ha == 'right'
+        assert elem.va == 'top'
+
+    def test_build_labels_matches_build_label(self, manager):
+        """Batch-built labels should equal one-at-a-time builds, unregistered."""
+        offsets = [(5, 5, 'left', 'bottom'), (-5, 0, 'right', 'center'),
+                   (0, -5, 'center', 'top'), (3, 4, 'center', 'center')]
+        batch = manager._build_labels('evt', (10, 20), 'Panipat', 9, offsets,
+                                      subtext='1526', subtext_fontsize=7)
+        single = [manager._build_label('evt', (10, 20), 'Panipat', 9, x, y, ha=ha, va=va,
+                                       subtext='1526', subtext_fontsize=7)
+                  for x, y, ha, va in offsets]
+        assert batch == single
+        assert manager.elements == {}
+
     def test_add_label_uses_priority(self, manager):
         """Priority should be stored on element."""
         elem = manager.add_label(
@@ -141,6 +166,33 @@ class TestPlacementManager:
         elem = manager.add_dot(id='test', coords=(0, 0))
         assert elem.type == 'dot'
 
+    def test_add_dots_matches_add_dot(self, manager):
+        """Bulk-added dots should equal dots added one at a time."""
+        coords = [(0.1, 0.2), (5.0, -3.3), (90.41, 23.81)]
+        bulk = manager.add_dots(['a', 'b', 'c'], coords, sizes_pts=[6, 8, 10],
+                                priorities=[100, 80, 70], groups=['g1', None, 'g3'])
+        single = PlacementManager(dpp=0.01)
+        expected = [
+            single.add_dot('a', coords[0], size_pts=6, priority=100, group='g1'),
+            single.add_dot('b', coords[1], size_pts=8, priority=80),
+            single.add_dot('c', coords[2], size_pts=10, priority=70, group='g3'),
+        ]
+        assert bulk == expected
+        assert [manager.elements[k] for k in 'abc'] == expected
+
+    def test_add_dots_beyond_initial_buffer(self, manager):
+        """Bulk-adding more dots than the initial buffer holds should grow it."""
+        n = 200
+        ids = [f"dot_{i}" for i in range(n)]
+        coords = [(i * 0.5, 0.0) for i in range(n)]
+        manager.add_dots(ids, coords, sizes_pts=[6] * n, priorities=[100] * n, groups=[None] * n)
+        assert len(manager.elements) == n
+        probe = PlacementElement(
+            id='probe', type='city_label', coords=coords[-1], offset=(0, 0),
+            bbox=(coords[-1][0] - 0.01, -0.01, coords[-1][0] + 0.01, 0.01), priority=50,
+        )
+        assert [e.id for e in manager.would_overlap(probe)] == [ids[-1]]
+
 
 class TestBboxIntersection:
     """Tests for bounding box intersection logic."""
@@ -252,6 +304,43 @@ class TestOverlapDetection:
         overlaps = manager.detect_overlaps()
         assert len(overlaps) == 1
 
+    def test_same_group_not_reported(self, manager):
+        """Overlapping elements in the same group should not be reported."""
+        manager.add_dot('dot1', coords=(0, 0), size_pts=100, group='g1')
+        manager.add_dot('dot2', coords=(0, 0), size_pts=100, group='g1')
+        manager.add_dot('dot3', coords=(0, 0), size_pts=100, group='g2')
+        overlaps = manager.detect_overlaps()
+        assert [(o[0].id, o[1].id) for o in overlaps] == [('dot1', 'dot3'), ('dot2', 'dot3')]
+
+    def test_long_chain_of_overlaps(self, manager):
+        """Enough elements for the sweep path; only neighbours overlap."""
+        for i in range(150):
+            manager.add_dot(f'dot{i}', coords=(i * 0.5, (i % 3) * 0.1), size_pts=60)
+        overlaps = manager.detect_overlaps()
+        assert [(o[0].id, o[1].id) for o in overlaps] == [
+            (f'dot{i}', f'dot{i + 1}') for i in range(149)
+        ]
+
+    def test_repeated_detection_tracks_changes(self, manager):
+        """Later calls should see elements added and removed since the last one."""
+        manager.add_dot('dot1', coords=(0, 0), size_pts=100)
+        manager.add_dot('dot2', coords=(0.5, 0), size_pts=100)
+        assert [(o[0].id, o[1].id) for o in manager.detect_overlaps()] == [('dot1', 'dot2')]
+
+        manager.add_dot('dot3', coords=(0.9, 0), size_pts=100)
+        manager.remove('dot1')
+        assert [(o[0].id, o[1].id) for o in manager.detect_overlaps()] == [('dot2', 'dot3')]
+
+    def test_removed_elements_not_reported(self, manager):
+        """Removed elements should drop out, even across buffer growth."""
+        for i in range(200):
+            manager.add_dot(f'temp{i}', coords=(0, 0), size_pts=100)
+            manager.remove(f'temp{i}')
+        manager.add_dot('dot1', coords=(0, 0), size_pts=100)
+        manager.add_dot('dot2', coords=(0.5, 0), size_pts=100)
+        overlaps = manager.detect_overlaps()
+        assert [(o[0].id, o[1].id) for o in overlaps] == [('dot1', 'dot2')]
+
 
 class TestPriorityConstants:
     """Tests for PRIORITY dictionary."""
@@ -760,3 +849,73 @@ class TestResolveArrows:
         # Both should pick 2x (shortest) since they don't conflict
         assert candidate1.resolved_gap == 2.0
         assert candidate2.resolved_gap == 2.0
+
+
+class TestWouldOverlapIndex:
+    """would_overlap() must give the same answers once the spatial index kicks in."""
+
+    def test_indexed_matches_linear_scan(self):
+        """Grid of dots large enough to build the index, with removals mixed in."""
+        manager = PlacementManager(dpp=0.01)
+        for i in range(40):
+            for j in range(20):
+                manager.add_dot(f'dot_{i}_{j}', coords=(i, j), size_pts=50)
+        for i in range(0, 40, 3):
+            manager.remove(f'dot_{i}_5')
+        manager.add_dot('late', coords=(10.2, 5.2), size_pts=50)
+
+        probe = PlacementElement(
+            id='probe', type='dot', coords=(10, 5), offset=(0, 0),
+            bbox=(9.7, 3.9, 10.3, 6.1), priority=0,
+        )
+        hits = [e.id for e in manager.would_overlap(probe)]
+        assert hits == ['dot_10_4', 'dot_10_5', 'dot_10_6', 'late']
+
+        manager.remove('dot_10_4')
+        hits = [e.id for e in manager.would_overlap(probe)]
+        assert hits == ['dot_10_5', 'dot_10_6', 'late']
+
+    def test_any_overlap_returns_first_blocker(self):
+        """any_overlap() should return the first element would_overlap() reports."""
+        manager = PlacementManager(dpp=0.01)
+        manager.add_dot('same_group', coords=(0, 0), size_pts=100, group='g1')
+        manager.add_dot('dot1', coords=(0.2, 0), size_pts=100)
+        manager.add_dot('dot2', coords=(0.4, 0), size_pts=100)
+        probe = PlacementElement(
+            id='probe', type='dot', coords=(0, 0), offset=(0, 0),
+            bbox=(-0.1, -0.1, 0.1, 0.1), priority=0, group='g1',
+        )
+        assert [e.id for e in manager.would_overlap(probe)] == ['dot1', 'dot2']
+        assert manager.any_overlap(probe).id == 'dot1'
+
+        probe.bbox = (5, 5, 6, 6)
+        assert manager.any_overlap(probe) is None
+
+
+class TestRotatedLabelLetters:
+    """Rotated labels are tested letter by letter, not by their loose AABB."""
+
+    @pytest.fixture
+    def manager(self):
+        return PlacementManager(dpp=0.01)
+
+    def test_diagonal_label_leaves_corners_free(self, manager):
+        """A dot in the empty corner of a 45° label's AABB should not overlap it."""
+        label = manager.add_river_label('river_test', (0, 0), 'Narmada River',
+                                        fontsize=10, rotation=45)
+        assert label.sub_bboxes.shape == (12, 4)  # space has no box
+
+        corner = manager.add_dot('corner', coords=(label.bbox[0] + 0.05, label.bbox[3] - 0.05),
+                                 size_pts=5)
+        on_text = manager.add_dot('on_text', coords=(0.1, 0.1), size_pts=5)
+        assert manager._bbox_intersects(label.bbox, corner.bbox)
+
+        overlapping = {(a.id, b.id) for a, b in manager.detect_overlaps()}
+        assert overlapping == {('river_test', 'on_text')}
+
+        probe = PlacementElement(
+            id='probe', type='dot', coords=corner.coords, offset=(0, 0),
+            bbox=corner.bbox, priority=0,
+        )
+        manager.remove('corner')
+        assert manager.would_overlap(probe) == []